@@ -39,16 +39,21 @@ from audiobook_backend.cli import MainDeps, parse_args
 from audiobook_backend.events import EventEmitter, start_heartbeat_emitter
 from audiobook_backend.export import (
     DEFAULT_SAMPLE_RATE,
+    PCM_PIPE_BUFFER_BYTES,
     _escape_ffmetadata,
     audio_to_int16,
     audio_to_segment,
+    close_export_stream,
     close_mp3_export_stream,
     export_pcm_file_to_m4b,
     export_pcm_file_to_mp3,
     export_pcm_to_m4b,
     export_pcm_to_mp3,
+    finalize_m4b_export_stream,
     generate_ffmetadata,
+    open_m4b_export_stream,
     open_mp3_export_stream,
+    write_pcm_chunk,
 )
 from audiobook_backend.job import JobPreparationDeps, build_checkpoint_config
 from audiobook_backend.metadata import apply_metadata_overrides
@@ -66,6 +71,7 @@ from audiobook_backend.runtime import (
     LOW_MEMORY_APPLE_PYTORCH_CHUNK_CHARS,
     _parse_env_bool,
     _get_macos_total_memory_bytes,
+    _mlx_runtime_available,
     default_pipeline_mode,
     resolve_pipeline_mode_for_args,
 )
@@ -119,21 +125,8 @@ def resolve_backend(backend: str) -> str:
             _AUTO_BACKEND_CACHE = "pytorch"
             return _AUTO_BACKEND_CACHE
 
-        try:
-            probe = subprocess.run(
-                [
-                    sys.executable,
-                    "-c",
-                    "import mlx.core as mx; mx.array([1.0]); print('ok')",
-                ],
-                capture_output=True,
-                timeout=8,
-            )
-            if probe.returncode == 0:
-                _AUTO_BACKEND_CACHE = "mlx"
-                return _AUTO_BACKEND_CACHE
-        except subprocess.TimeoutExpired:
-            _AUTO_BACKEND_CACHE = "pytorch"
+        if _mlx_runtime_available():
+            _AUTO_BACKEND_CACHE = "mlx"
             return _AUTO_BACKEND_CACHE
 
     _AUTO_BACKEND_CACHE = "pytorch"
@@ -248,9 +241,11 @@ def _build_main_deps() -> MainDeps:
         cleanup_checkpoint=cleanup_checkpoint,
         create_backend=create_backend,
         open_mp3_export_stream=open_mp3_export_stream,
-        close_mp3_export_stream=close_mp3_export_stream,
+        close_export_stream=close_export_stream,
         export_pcm_file_to_mp3=export_pcm_file_to_mp3,
         export_pcm_file_to_m4b=export_pcm_file_to_m4b,
+        open_m4b_export_stream=open_m4b_export_stream,
+        finalize_m4b_export_stream=finalize_m4b_export_stream,
         run_sequential_pipeline=_run_sequential_pipeline,
         run_overlap3_pipeline=_run_overlap3_pipeline,
         cleanup_backend=_cleanup_backend,
@@ -3,6 +3,9 @@ from typing import List, Tuple
 
 from .models import ParsedSection, TextChunk
 
+PARAGRAPH_SPLIT_RE = re.compile(r"\n+")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 def _clean_text(text: str) -> str:
     text = re.sub(r"\s+", " ", text).strip()
@@ -21,6 +24,62 @@ def _clean_text_with_paragraphs(text: str) -> str:
     return "\n\n".join(paragraphs)
 
 
+def _split_oversized_paragraph(paragraph: str, chunk_chars: int) -> List[str]:
+    if len(paragraph) <= chunk_chars:
+        return [paragraph]
+
+    pieces: List[str] = []
+    sentences = SENTENCE_SPLIT_RE.split(paragraph)
+    sentence_buffer = ""
+
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        if len(sentence) > chunk_chars:
+            if sentence_buffer:
+                pieces.append(sentence_buffer)
+                sentence_buffer = ""
+            for start in range(0, len(sentence), chunk_chars):
+                pieces.append(sentence[start:start + chunk_chars])
+            continue
+
+        candidate = f"{sentence_buffer} {sentence}".strip()
+        if len(candidate) <= chunk_chars:
+            sentence_buffer = candidate
+        else:
+            if sentence_buffer:
+                pieces.append(sentence_buffer)
+            sentence_buffer = sentence
+
+    if sentence_buffer:
+        pieces.append(sentence_buffer)
+
+    return pieces if pieces else [paragraph]
+
+
+def _split_chapter_text(text: str, chunk_chars: int) -> List[str]:
+    """Split one chapter's text into chunk strings; chapters are independent."""
+    chunk_texts: List[str] = []
+    buffer = ""
+    for paragraph in PARAGRAPH_SPLIT_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        for piece in _split_oversized_paragraph(paragraph, chunk_chars):
+            if len(buffer) + len(piece) + 1 <= chunk_chars:
+                buffer = f"{buffer} {piece}".strip()
+            else:
+                if buffer:
+                    chunk_texts.append(buffer)
+                buffer = piece
+
+    if buffer:
+        chunk_texts.append(buffer)
+    return chunk_texts
+
+
 def split_text_to_chunks(
     chapters: List[Tuple[str, str] | ParsedSection], chunk_chars: int
 ) -> Tuple[List[TextChunk], List[Tuple[int, str]]]:
@@ -28,40 +87,6 @@ def split_text_to_chunks(
     chunks: List[TextChunk] = []
     chapter_start_indices: List[Tuple[int, str]] = []
 
-    def split_oversized_paragraph(paragraph: str) -> List[str]:
-        if len(paragraph) <= chunk_chars:
-            return [paragraph]
-
-        pieces: List[str] = []
-        sentences = re.split(r"(?<=[.!?])\s+", paragraph)
-        sentence_buffer = ""
-
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-
-            if len(sentence) > chunk_chars:
-                if sentence_buffer:
-                    pieces.append(sentence_buffer)
-                    sentence_buffer = ""
-                for start in range(0, len(sentence), chunk_chars):
-                    pieces.append(sentence[start:start + chunk_chars])
-                continue
-
-            candidate = f"{sentence_buffer} {sentence}".strip()
-            if len(candidate) <= chunk_chars:
-                sentence_buffer = candidate
-            else:
-                if sentence_buffer:
-                    pieces.append(sentence_buffer)
-                sentence_buffer = sentence
-
-        if sentence_buffer:
-            pieces.append(sentence_buffer)
-
-        return pieces if pieces else [paragraph]
-
     for chapter in chapters:
         if isinstance(chapter, ParsedSection):
             title = chapter.title
@@ -69,24 +94,11 @@ def split_text_to_chunks(
         else:
             title, text = chapter
 
-        paragraphs = [p.strip() for p in re.split(r"\n+", text) if p.strip()]
-        if not paragraphs:
+        chunk_texts = _split_chapter_text(text, chunk_chars)
+        if not chunk_texts:
             continue
 
         chapter_start_indices.append((len(chunks), title))
-
-        buffer = ""
-        for paragraph in paragraphs:
-            for piece in split_oversized_paragraph(paragraph):
-                if len(buffer) + len(piece) + 1 <= chunk_chars:
-                    buffer = f"{buffer} {piece}".strip()
-                else:
-                    if buffer:
-                        chunks.append(TextChunk(title, buffer))
-                    buffer = piece
-
-        if buffer:
-            chunks.append(TextChunk(title, buffer))
+        chunks.extend(TextChunk(title, chunk_text) for chunk_text in chunk_texts)
 
     return chunks, chapter_start_indices
-
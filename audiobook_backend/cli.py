@@ -1,18 +1,12 @@
 import argparse
+import functools
 import gc
 import os
 import sys
 import tempfile
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional
-
-from rich.progress import (
-    BarColumn,
-    Progress,
-    TextColumn,
-    TimeElapsedColumn,
-    TimeRemainingColumn,
-)
+from typing import Any, Callable, Iterator, Optional
 
 from backends import TTSBackend, create_backend
 from checkpoint import (
@@ -30,9 +24,11 @@ from .events import EventEmitter, start_heartbeat_emitter
 from .epub_parser import extract_epub_metadata
 from .export import (
     DEFAULT_SAMPLE_RATE,
-    close_mp3_export_stream,
+    close_export_stream,
     export_pcm_file_to_m4b,
     export_pcm_file_to_mp3,
+    finalize_m4b_export_stream,
+    open_m4b_export_stream,
     open_mp3_export_stream,
 )
 from .job import (
@@ -62,9 +58,11 @@ class MainDeps:
     cleanup_checkpoint: Callable[[str], None]
     create_backend: Callable[[str], TTSBackend]
     open_mp3_export_stream: Callable[..., Any]
-    close_mp3_export_stream: Callable[[Any], None]
+    close_export_stream: Callable[[Any], None]
     export_pcm_file_to_mp3: Callable[..., None]
     export_pcm_file_to_m4b: Callable[..., None]
+    open_m4b_export_stream: Callable[..., Any]
+    finalize_m4b_export_stream: Callable[..., None]
     run_sequential_pipeline: Callable[..., Any]
     run_overlap3_pipeline: Callable[..., Any]
     cleanup_backend: Callable[[Optional[TTSBackend]], Optional[BaseException]]
@@ -93,9 +91,11 @@ DEFAULT_MAIN_DEPS = MainDeps(
     cleanup_checkpoint=cleanup_checkpoint,
     create_backend=create_backend,
     open_mp3_export_stream=open_mp3_export_stream,
-    close_mp3_export_stream=close_mp3_export_stream,
+    close_export_stream=close_export_stream,
     export_pcm_file_to_mp3=export_pcm_file_to_mp3,
     export_pcm_file_to_m4b=export_pcm_file_to_m4b,
+    open_m4b_export_stream=open_m4b_export_stream,
+    finalize_m4b_export_stream=finalize_m4b_export_stream,
     run_sequential_pipeline=run_sequential_pipeline,
     run_overlap3_pipeline=run_overlap3_pipeline,
     cleanup_backend=cleanup_backend,
@@ -235,6 +235,14 @@ def parse_args() -> argparse.Namespace:
         "--log_file",
         help="Optional path to append backend logs",
     )
+    parser.add_argument(
+        "--async_events",
+        action="store_true",
+        help=(
+            "Experimental: write events from a background thread so stdout/log "
+            "I/O stays off the inference path (not used by the CLI frontend)"
+        ),
+    )
     return parser.parse_args()
 
 
@@ -281,6 +289,17 @@ def inspect_job(
     )
 
 
+@contextmanager
+def _input_epub_errors(input_path: str) -> Iterator[None]:
+    """Report a missing input EPUB the same way regardless of which reader hit it."""
+    try:
+        yield
+    except FileNotFoundError as exc:
+        if exc.filename != input_path:
+            raise
+        raise FileNotFoundError(f"Input EPUB not found: {input_path}") from exc
+
+
 def main(deps: Optional[MainDeps] = None) -> None:
     deps = deps or DEFAULT_MAIN_DEPS
 
@@ -294,12 +313,10 @@ def main(deps: Optional[MainDeps] = None) -> None:
         event_format=args.event_format,
         job_id=os.path.basename(args.output) or "job",
         log_file=args.log_file,
+        async_events=args.async_events,
     )
 
     try:
-        if not os.path.exists(args.input):
-            raise FileNotFoundError(f"Input EPUB not found: {args.input}")
-
         if args.no_checkpoint:
             events.warn(
                 "--no_checkpoint is deprecated and has no effect "
@@ -318,7 +335,8 @@ def main(deps: Optional[MainDeps] = None) -> None:
             )
 
         if args.extract_metadata:
-            metadata = deps.extract_epub_metadata(args.input)
+            with _input_epub_errors(args.input):
+                metadata = deps.extract_epub_metadata(args.input)
             events.emit("metadata", key="title", value=metadata.title)
             events.emit("metadata", key="author", value=metadata.author)
             events.emit(
@@ -329,7 +347,8 @@ def main(deps: Optional[MainDeps] = None) -> None:
             return
 
         if args.inspect_job:
-            inspection = deps.inspect_job(args, preparation_deps=deps.preparation_deps)
+            with _input_epub_errors(args.input):
+                inspection = deps.inspect_job(args, preparation_deps=deps.preparation_deps)
             events.emit("inspection", result=inspection.to_dict())
             return
 
@@ -341,7 +360,8 @@ def main(deps: Optional[MainDeps] = None) -> None:
             if state is None:
                 events.emit("checkpoint", code="NONE")
             else:
-                current_hash = deps.compute_epub_hash(args.input)
+                with _input_epub_errors(args.input):
+                    current_hash = deps.compute_epub_hash(args.input)
                 if state.epub_hash != current_hash:
                     events.emit("checkpoint", code="INVALID", detail="hash_mismatch")
                 else:
@@ -359,19 +379,20 @@ def main(deps: Optional[MainDeps] = None) -> None:
             thread_name="parse-heartbeat",
         )
         try:
-            prepared = deps.prepare_job(
-                args,
-                inspect_checkpoint_state=True,
-                progress_callback=lambda current_item, total_items, chapter_count: (
-                    events.emit(
-                        "parse_progress",
-                        current_item=current_item,
-                        total_items=total_items,
-                        current_chapter_count=chapter_count,
-                    )
-                ),
-                deps=deps.preparation_deps,
-            )
+            with _input_epub_errors(args.input):
+                prepared = deps.prepare_job(
+                    args,
+                    inspect_checkpoint_state=True,
+                    progress_callback=lambda current_item, total_items, chapter_count: (
+                        events.emit(
+                            "parse_progress",
+                            current_item=current_item,
+                            total_items=total_items,
+                            current_chapter_count=chapter_count,
+                        )
+                    ),
+                    deps=deps.preparation_deps,
+                )
         finally:
             parse_heartbeat_stop.set()
             parse_heartbeat_thread.join(timeout=1)
@@ -393,14 +414,15 @@ def main(deps: Optional[MainDeps] = None) -> None:
         completed_chunks: set[int] = set()
         checkpoint_state = None
 
+        checkpoint_config = build_checkpoint_config(
+            args,
+            prepared.resolved_backend,
+            prepared.chunk_chars,
+            prepared.resolved_device,
+        )
+
         if use_checkpoint and args.resume:
-            config_for_verify = build_checkpoint_config(
-                args,
-                prepared.resolved_backend,
-                prepared.chunk_chars,
-                prepared.resolved_device,
-            )
-            if deps.verify_checkpoint(checkpoint_dir, args.input, config_for_verify):
+            if deps.verify_checkpoint(checkpoint_dir, args.input, checkpoint_config):
                 state = deps.load_checkpoint(checkpoint_dir)
                 if state and state.total_chunks == total_chunks:
                     completed_chunks = set(state.completed_chunks)
@@ -413,7 +435,7 @@ def main(deps: Optional[MainDeps] = None) -> None:
 
         backend: Optional[TTSBackend] = None
         spool_path: Optional[str] = None
-        mp3_export_proc: Optional[Any] = None
+        export_proc: Optional[Any] = None
         should_cleanup_checkpoint = False
         sample_rate = DEFAULT_SAMPLE_RATE
         main_error: Optional[BaseException] = None
@@ -431,13 +453,31 @@ def main(deps: Optional[MainDeps] = None) -> None:
                     f"Failed to initialize '{prepared.resolved_backend}' backend: {exc}"
                 ) from exc
 
-            output_dir = os.path.dirname(os.path.abspath(args.output))
-            if output_dir and not os.path.exists(output_dir):
+            output_dir = os.path.dirname(args.output) or "."
+            try:
+                os.stat(output_dir)
+            except FileNotFoundError:
                 os.makedirs(output_dir, exist_ok=True)
 
-            use_mp3_stream = args.format == "mp3" and not use_checkpoint
-            if use_mp3_stream:
-                mp3_export_proc = deps.open_mp3_export_stream(
+            use_export_stream = not use_checkpoint
+            if use_export_stream and args.format == "m4b":
+                # Chapters are only known once inference finishes, so the AAC
+                # encode streams into a temporary track that is remuxed with
+                # metadata at export time instead of spooling raw PCM.
+                encoded_file = deps.tempfile_module.NamedTemporaryFile(
+                    suffix=".m4a",
+                    delete=False,
+                )
+                spool_path = encoded_file.name
+                encoded_file.close()
+                export_proc = deps.open_m4b_export_stream(
+                    spool_path,
+                    sample_rate=sample_rate,
+                    bitrate=args.bitrate,
+                    normalize=args.normalize,
+                )
+            elif use_export_stream:
+                export_proc = deps.open_mp3_export_stream(
                     args.output,
                     sample_rate=sample_rate,
                     bitrate=args.bitrate,
@@ -454,12 +494,6 @@ def main(deps: Optional[MainDeps] = None) -> None:
             if use_checkpoint:
                 if checkpoint_state is None:
                     epub_hash = deps.compute_epub_hash(args.input)
-                    checkpoint_config = build_checkpoint_config(
-                        args,
-                        prepared.resolved_backend,
-                        prepared.chunk_chars,
-                        prepared.resolved_device,
-                    )
                     checkpoint_state = CheckpointState(
                         epub_hash=epub_hash,
                         config=checkpoint_config,
@@ -474,6 +508,14 @@ def main(deps: Optional[MainDeps] = None) -> None:
             progress = None
             task_id = None
             if not args.no_rich:
+                from rich.progress import (
+                    BarColumn,
+                    Progress,
+                    TextColumn,
+                    TimeElapsedColumn,
+                    TimeRemainingColumn,
+                )
+
                 progress = Progress(
                     TextColumn("[bold]Generating[/bold]"),
                     BarColumn(),
@@ -484,7 +526,9 @@ def main(deps: Optional[MainDeps] = None) -> None:
                 task_id = progress.add_task("tts", total=total_chunks, completed=0)
 
             mode_description = (
-                "streaming MP3 export" if use_mp3_stream else "disk spooling"
+                f"streaming {args.format.upper()} export"
+                if use_export_stream
+                else "disk spooling"
             )
             events.info(
                 f"Processing {total_chunks} chunks with {backend.name} backend "
@@ -493,109 +537,79 @@ def main(deps: Optional[MainDeps] = None) -> None:
 
             events.emit("phase", phase="INFERENCE")
 
-            if progress:
-                with progress:
-                    if prepared.pipeline_mode == "overlap3":
-                        run_result = deps.run_overlap3_pipeline(
-                            chunks=prepared.chunks,
-                            backend=backend,
-                            voice=args.voice,
-                            speed=args.speed,
-                            split_pattern=args.split_pattern,
-                            prefetch_chunks=args.prefetch_chunks,
-                            pcm_queue_size=args.pcm_queue_size,
-                            events=events,
-                            progress=progress,
-                            task_id=task_id,
-                            mp3_export_proc=mp3_export_proc,
-                        )
-                    else:
-                        run_result = deps.run_sequential_pipeline(
-                            chunks=prepared.chunks,
-                            backend=backend,
-                            voice=args.voice,
-                            speed=args.speed,
-                            split_pattern=args.split_pattern,
-                            events=events,
-                            progress=progress,
-                            task_id=task_id,
-                            use_mp3_stream=use_mp3_stream,
-                            mp3_export_proc=mp3_export_proc,
-                            spool_path=spool_path,
-                            use_checkpoint=use_checkpoint,
-                            resume=args.resume,
-                            checkpoint_dir=checkpoint_dir,
-                            completed_chunks=completed_chunks,
-                            checkpoint_state=checkpoint_state,
-                        )
+            if prepared.pipeline_mode == "overlap3":
+                run_pipeline = functools.partial(
+                    deps.run_overlap3_pipeline,
+                    prefetch_chunks=args.prefetch_chunks,
+                    pcm_queue_size=args.pcm_queue_size,
+                )
             else:
-                if prepared.pipeline_mode == "overlap3":
-                    run_result = deps.run_overlap3_pipeline(
-                        chunks=prepared.chunks,
-                        backend=backend,
-                        voice=args.voice,
-                        speed=args.speed,
-                        split_pattern=args.split_pattern,
-                        prefetch_chunks=args.prefetch_chunks,
-                        pcm_queue_size=args.pcm_queue_size,
-                        events=events,
-                        progress=progress,
-                        task_id=task_id,
-                        mp3_export_proc=mp3_export_proc,
-                    )
-                else:
-                    run_result = deps.run_sequential_pipeline(
-                        chunks=prepared.chunks,
-                        backend=backend,
-                        voice=args.voice,
-                        speed=args.speed,
-                        split_pattern=args.split_pattern,
-                        events=events,
-                        progress=progress,
-                        task_id=task_id,
-                        use_mp3_stream=use_mp3_stream,
-                        mp3_export_proc=mp3_export_proc,
-                        spool_path=spool_path,
-                        use_checkpoint=use_checkpoint,
-                        resume=args.resume,
-                        checkpoint_dir=checkpoint_dir,
-                        completed_chunks=completed_chunks,
-                        checkpoint_state=checkpoint_state,
-                    )
+                run_pipeline = functools.partial(
+                    deps.run_sequential_pipeline,
+                    use_export_stream=use_export_stream,
+                    spool_path=None if use_export_stream else spool_path,
+                    use_checkpoint=use_checkpoint,
+                    resume=args.resume,
+                    checkpoint_dir=checkpoint_dir,
+                    completed_chunks=completed_chunks,
+                    checkpoint_state=checkpoint_state,
+                )
+
+            with progress if progress else nullcontext():
+                run_result = run_pipeline(
+                    chunks=prepared.chunks,
+                    backend=backend,
+                    voice=args.voice,
+                    speed=args.speed,
+                    split_pattern=args.split_pattern,
+                    events=events,
+                    progress=progress,
+                    task_id=task_id,
+                    export_proc=export_proc,
+                )
 
             events.emit("phase", phase="CONCATENATING")
             events.info("Concatenating audio segments...")
 
             chapter_infos: list[ChapterInfo] = []
             if args.format == "m4b" and prepared.chapter_start_indices:
-                for index, (chunk_idx, title) in enumerate(prepared.chapter_start_indices):
-                    start_sample = (
-                        run_result.chunk_sample_offsets[chunk_idx]
-                        if chunk_idx < len(run_result.chunk_sample_offsets)
-                        else 0
-                    )
-
-                    if index + 1 < len(prepared.chapter_start_indices):
-                        next_chunk_idx = prepared.chapter_start_indices[index + 1][0]
-                        end_sample = (
-                            run_result.chunk_sample_offsets[next_chunk_idx]
-                            if next_chunk_idx < len(run_result.chunk_sample_offsets)
-                            else run_result.total_samples
-                        )
-                    else:
-                        end_sample = run_result.total_samples
-
+                # A trailing total_samples sentinel makes every chunk index,
+                # including the one past the last chapter, a valid lookup.
+                offsets_ext = list(run_result.chunk_sample_offsets)
+                offsets_ext.append(run_result.total_samples)
+                last_offset = len(offsets_ext) - 1
+                chapter_ids = [
+                    min(chunk_idx, last_offset)
+                    for chunk_idx, _ in prepared.chapter_start_indices
+                ]
+                chapter_ids.append(last_offset)
+
+                for index, (_, title) in enumerate(prepared.chapter_start_indices):
                     chapter_title = title if title else f"Chapter {index + 1}"
                     chapter_infos.append(
                         ChapterInfo(
                             title=chapter_title,
-                            start_sample=start_sample,
-                            end_sample=end_sample,
+                            start_sample=offsets_ext[chapter_ids[index]],
+                            end_sample=offsets_ext[chapter_ids[index + 1]],
                         )
                     )
 
             events.emit("phase", phase="EXPORTING")
-            if args.format == "m4b":
+            if args.format == "m4b" and use_export_stream:
+                if export_proc is None or spool_path is None:
+                    raise RuntimeError("M4B export process was not initialized.")
+                deps.finalize_m4b_export_stream(
+                    export_proc,
+                    spool_path,
+                    args.output,
+                    metadata=prepared.book_metadata,
+                    chapters=chapter_infos,
+                    sample_rate=sample_rate,
+                    bitrate=args.bitrate,
+                    has_audio=run_result.total_samples > 0,
+                )
+                export_proc = None
+            elif args.format == "m4b":
                 if spool_path is None:
                     raise RuntimeError("M4B export requires a spool path.")
                 deps.export_pcm_file_to_m4b(
@@ -608,11 +622,11 @@ def main(deps: Optional[MainDeps] = None) -> None:
                     normalize=args.normalize,
                 )
             else:
-                if use_mp3_stream:
-                    if mp3_export_proc is None:
+                if use_export_stream:
+                    if export_proc is None:
                         raise RuntimeError("MP3 export process was not initialized.")
-                    deps.close_mp3_export_stream(mp3_export_proc)
-                    mp3_export_proc = None
+                    deps.close_export_stream(export_proc)
+                    export_proc = None
                 else:
                     if spool_path is None:
                         raise RuntimeError("MP3 export requires a spool path.")
@@ -646,7 +660,7 @@ def main(deps: Optional[MainDeps] = None) -> None:
             if cleanup_error is None and backend_cleanup_error is not None:
                 cleanup_error = backend_cleanup_error
 
-            ffmpeg_cleanup_error = deps.cleanup_ffmpeg_process(mp3_export_proc)
+            ffmpeg_cleanup_error = deps.cleanup_ffmpeg_process(export_proc)
             if cleanup_error is None and ffmpeg_cleanup_error is not None:
                 cleanup_error = ffmpeg_cleanup_error
 
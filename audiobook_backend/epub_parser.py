@@ -1,7 +1,8 @@
 import re
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import warnings
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, XMLParsedAsHTMLWarning
 
 from .chunking import _clean_text, _clean_text_with_paragraphs
 from .models import BookMetadata, ParsedEpub, ParsedSection
@@ -18,6 +19,16 @@ except ImportError:  # pragma: no cover - exercised via fallback tests
     ebooklib = _EbooklibFallback()
     epub = None
 
+# lxml's HTML builder closes an open <p> at the first nested block tag (and
+# drops CDATA), so the leaf-block walk below loses the text that follows it.
+# html.parser keeps the markup as written.
+HTML_PARSER = "html.parser"
+
+# Only <title> (section title fallback) and <body> are read, so skip building
+# the rest of <head>. lxml wraps bare fragments in <body>; html.parser does
+# not, so the strainer is limited to the lxml builder.
+DOCUMENT_STRAINER = SoupStrainer(["title", "body"]) if HTML_PARSER == "lxml" else None
+
 
 SECTION_BLOCK_TAGS = (
     "p",
@@ -33,10 +44,20 @@ SECTION_BLOCK_TAGS = (
     "dt",
     "dd",
 )
+SECTION_BLOCK_TAG_SET = frozenset(SECTION_BLOCK_TAGS)
 NAV_DOCUMENT_HINT_RE = re.compile(
     r"(^|[\\/._-])(nav|toc|contents?|landmarks?)([\\/._-]|$)",
     re.IGNORECASE,
 )
+TOC_ATTR_RE = re.compile(r"\b(toc|landmarks?)\b", re.IGNORECASE)
+NON_CONTENT_TAGS = frozenset(("script", "style", "nav"))
+# Conservative byte-level test for anything _prune_non_content_nodes could
+# remove; a false positive only costs the normal pruning walk.
+NON_CONTENT_MARKER_RE = re.compile(rb"<\s*(?:script|style|nav)\b|toc|landmark", re.IGNORECASE)
+# Image-only cover pages and empty spacer documents have no text between the
+# body tags once markup is removed; a false negative only costs the normal parse.
+BODY_CONTENT_RE = re.compile(rb"<body\b[^>]*>(.*?)</body\s*>", re.IGNORECASE | re.DOTALL)
+MARKUP_TAG_RE = re.compile(rb"<[^>]*>")
 
 
 def _require_epub_support() -> None:
@@ -51,6 +72,32 @@ def _load_epub_book(epub_path: str) -> Any:
     return epub.read_epub(epub_path)
 
 
+def _find_cover_item(book: Any) -> Any:
+    cover_id = None
+    cover_meta = book.get_metadata("OPF", "cover")
+    if cover_meta:
+        cover_id = cover_meta[0][1].get("content") if cover_meta[0][1] else None
+
+    # One manifest walk; precedence stays ITEM_COVER, then the OPF cover id,
+    # then the first image with "cover" in its name.
+    opf_cover = None
+    named_cover = None
+    for item in book.get_items():
+        item_type = item.get_type()
+        if item_type == ebooklib.ITEM_COVER:
+            return item
+        if opf_cover is None and cover_id and item.get_id() == cover_id:
+            opf_cover = item
+        elif (
+            named_cover is None
+            and item_type == ebooklib.ITEM_IMAGE
+            and "cover" in item.get_name().lower()
+        ):
+            named_cover = item
+
+    return opf_cover if opf_cover is not None else named_cover
+
+
 def _extract_book_metadata(book: Any) -> BookMetadata:
     title_meta = book.get_metadata("DC", "title")
     title = title_meta[0][0] if title_meta else "Unknown Title"
@@ -60,30 +107,10 @@ def _extract_book_metadata(book: Any) -> BookMetadata:
 
     cover_image = None
     cover_mime_type = None
-
-    for item in book.get_items_of_type(ebooklib.ITEM_COVER):
-        cover_image = item.get_content()
-        cover_mime_type = item.media_type
-        break
-
-    if cover_image is None:
-        cover_meta = book.get_metadata("OPF", "cover")
-        if cover_meta:
-            cover_id = cover_meta[0][1].get("content") if cover_meta[0][1] else None
-            if cover_id:
-                for item in book.get_items():
-                    if item.get_id() == cover_id:
-                        cover_image = item.get_content()
-                        cover_mime_type = item.media_type
-                        break
-
-    if cover_image is None:
-        for item in book.get_items_of_type(ebooklib.ITEM_IMAGE):
-            item_name = item.get_name().lower()
-            if "cover" in item_name:
-                cover_image = item.get_content()
-                cover_mime_type = item.media_type
-                break
+    cover_item = _find_cover_item(book)
+    if cover_item is not None:
+        cover_image = cover_item.get_content()
+        cover_mime_type = cover_item.media_type
 
     return BookMetadata(
         title=title,
@@ -109,24 +136,23 @@ def _normalize_href_reference(value: Optional[str]) -> str:
 
 
 def _iter_toc_entries(entries: Any) -> Any:
-    if not entries:
-        return
-
-    if isinstance(entries, tuple):
-        for entry in entries:
-            yield from _iter_toc_entries(entry)
-        return
+    # Explicit stack instead of recursive generators: pre-order, same as the
+    # nesting in book.toc, without a generator frame per level.
+    stack = [entries]
+    while stack:
+        entry = stack.pop()
+        if not entry:
+            continue
 
-    if isinstance(entries, list):
-        for entry in entries:
-            yield from _iter_toc_entries(entry)
-        return
+        if isinstance(entry, (list, tuple)):
+            stack.extend(reversed(entry))
+            continue
 
-    yield entries
+        yield entry
 
-    subitems = getattr(entries, "subitems", None)
-    if subitems:
-        yield from _iter_toc_entries(subitems)
+        subitems = getattr(entry, "subitems", None)
+        if subitems:
+            stack.append(subitems)
 
 
 def _build_toc_label_map(book: Any) -> Dict[str, str]:
@@ -173,7 +199,7 @@ def _get_item_reference_candidates(item: Any) -> List[str]:
     return normalized_candidates
 
 
-def _get_item_properties(item: Any) -> List[str]:
+def _get_item_properties(item: Any) -> Collection[Any]:
     properties = getattr(item, "properties", None)
     if properties is None:
         get_properties = getattr(item, "get_properties", None)
@@ -183,58 +209,93 @@ def _get_item_properties(item: Any) -> List[str]:
             except TypeError:
                 properties = None
 
-    if not properties:
-        return []
-
-    if not isinstance(properties, (list, tuple, set)):
-        return []
+    if not properties or not isinstance(properties, (list, tuple, set)):
+        return ()
 
-    return [str(property_value).lower() for property_value in properties]
+    return properties
 
 
-def _is_navigation_document(item: Any) -> bool:
-    properties = _get_item_properties(item)
-    if "nav" in properties:
+def _is_navigation_document(item: Any, reference_candidates: List[str]) -> bool:
+    if any(
+        str(property_value).lower() == "nav"
+        for property_value in _get_item_properties(item)
+    ):
         return True
 
     return any(
         NAV_DOCUMENT_HINT_RE.search(candidate) is not None
-        for candidate in _get_item_reference_candidates(item)
+        for candidate in reference_candidates
     )
 
 
 def _prune_non_content_nodes(body: Any) -> None:
-    for node in list(body.find_all(["script", "style"])):
-        node.decompose()
-
+    search_toc_marker = TOC_ATTR_RE.search
     for node in list(body.find_all(True)):
-        if node.name == "nav":
+        # Descendants of an already-removed node are detached as well.
+        if node.parent is None:
+            continue
+
+        if node.name in NON_CONTENT_TAGS:
             node.decompose()
             continue
 
-        attr_values = [
-            node.get("role"),
-            node.get("epub:type"),
-            node.get("id"),
-            " ".join(node.get("class", [])),
-        ]
-        if any(
-            isinstance(value, str)
-            and re.search(r"\b(toc|landmarks?)\b", value, re.IGNORECASE)
-            for value in attr_values
+        attrs = node.attrs
+        if not attrs:
+            continue
+
+        for value in (
+            attrs.get("role"),
+            attrs.get("epub:type"),
+            attrs.get("id"),
+            " ".join(attrs.get("class", ())),
         ):
-            node.decompose()
+            if isinstance(value, str) and search_toc_marker(value):
+                node.decompose()
+                break
+
 
+def _find_leaf_blocks(body: Any) -> List[Any]:
+    """Return block tags that contain no nested block tags, in document order."""
+    blocks = body.find_all(SECTION_BLOCK_TAG_SET)
+    has_nested_block: set[int] = set()
+    for node in blocks:
+        parent = node.parent
+        while parent is not None and parent is not body:
+            if parent.name in SECTION_BLOCK_TAG_SET:
+                # Its block ancestors were marked when it was.
+                if id(parent) in has_nested_block:
+                    break
+                has_nested_block.add(id(parent))
+            parent = parent.parent
 
-def _extract_body_text(soup: BeautifulSoup) -> str:
+    return [node for node in blocks if id(node) not in has_nested_block]
+
+
+def _may_contain_non_content(content: Any) -> bool:
+    if not isinstance(content, (bytes, bytearray)):
+        return True
+
+    body_start = content.find(b"<body")
+    return NON_CONTENT_MARKER_RE.search(content, max(body_start, 0)) is not None
+
+
+def _may_contain_text(content: Any) -> bool:
+    if not isinstance(content, (bytes, bytearray)):
+        return True
+
+    match = BODY_CONTENT_RE.search(content)
+    if match is None:
+        return True
+    return bool(MARKUP_TAG_RE.sub(b"", match.group(1)).strip())
+
+
+def _extract_body_text(soup: BeautifulSoup, prune: bool = True) -> str:
     body = soup.body or soup
-    _prune_non_content_nodes(body)
+    if prune:
+        _prune_non_content_nodes(body)
 
     paragraphs: List[str] = []
-    for node in body.find_all(SECTION_BLOCK_TAGS):
-        if node.find(SECTION_BLOCK_TAGS):
-            continue
-
+    for node in _find_leaf_blocks(body):
         text = _clean_text(node.get_text(" ", strip=True))
         if text:
             paragraphs.append(text)
@@ -247,20 +308,33 @@ def _extract_body_text(soup: BeautifulSoup) -> str:
     return _clean_text_with_paragraphs("\n\n".join(paragraphs))
 
 
+def _iter_title_headings(body: Any) -> Any:
+    """Yield the first <h1>, then the first <h2>, scanning only as far as needed."""
+    first_heading = body.find(("h1", "h2"))
+    if first_heading is None:
+        return
+
+    # No h1 can precede the first h1/h2, so the other tag is a forward search.
+    if first_heading.name == "h1":
+        yield first_heading
+        yield first_heading.find_next("h2")
+    else:
+        yield first_heading.find_next("h1")
+        yield first_heading
+
+
 def _resolve_section_title(
-    item: Any,
+    reference_candidates: List[str],
     soup: BeautifulSoup,
     toc_labels: Dict[str, str],
     chapter_number: int,
 ) -> str:
-    for candidate in _get_item_reference_candidates(item):
+    for candidate in reference_candidates:
         toc_title = toc_labels.get(candidate)
         if toc_title:
             return toc_title
 
-    body = soup.body or soup
-    for heading_tag in ("h1", "h2"):
-        heading = body.find(heading_tag)
+    for heading in _iter_title_headings(soup.body or soup):
         if heading is None:
             continue
 
@@ -287,19 +361,35 @@ def parse_loaded_epub(
     toc_labels = _build_toc_label_map(book)
 
     for idx, item in enumerate(document_items, start=1):
-        if _is_navigation_document(item):
+        reference_candidates = _get_item_reference_candidates(item)
+        if _is_navigation_document(item, reference_candidates):
             if progress_callback is not None:
                 progress_callback(idx, total_items, len(chapters))
             continue
 
-        soup = BeautifulSoup(item.get_content(), "html.parser")
-        text = _extract_body_text(soup)
+        content = item.get_content()
+        if not _may_contain_text(content):
+            if progress_callback is not None:
+                progress_callback(idx, total_items, len(chapters))
+            continue
+
+        # EPUB documents are XHTML, which bs4 flags on every HTML-builder parse; the
+        # warning would otherwise reach the CLI as stderr noise per document.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", XMLParsedAsHTMLWarning)
+            soup = BeautifulSoup(content, HTML_PARSER, parse_only=DOCUMENT_STRAINER)
+        text = _extract_body_text(soup, prune=_may_contain_non_content(content))
         if text:
             chapters.append(
                 ParsedSection(
-                    title=_resolve_section_title(item, soup, toc_labels, len(chapters) + 1),
+                    title=_resolve_section_title(
+                        reference_candidates,
+                        soup,
+                        toc_labels,
+                        len(chapters) + 1,
+                    ),
                     text=text,
-                    href=next(iter(_get_item_reference_candidates(item)), ""),
+                    href=reference_candidates[0] if reference_candidates else "",
                     item_id=(
                         item.get_id()
                         if callable(getattr(item, "get_id", None))
@@ -1,106 +1,283 @@
+import io
 import json
 import os
 import sys
 import threading
 import time
-from typing import Any, Dict, Optional, TextIO, Tuple
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_EVENT_BUFFER_BYTES = 1 << 20
+LOG_FILE_BUFFER_BYTES = 64 * 1024
+# Events that mark run milestones; the log file is flushed when one is written
+# so a crash log always ends at the last phase or checkpoint transition.
+LOG_FLUSH_EVENTS = frozenset(("phase", "checkpoint", "error", "done"))
+# Between milestones the log is also flushed once this much time has passed, so
+# a native crash mid-inference loses at most about a second of progress/timing.
+LOG_FLUSH_INTERVAL_SECONDS = 1.0
+# Event types the CLI's stall detector treats as signs of life (BatchProgress.tsx
+# resets its heartbeat timer on these); log and metadata lines do not count.
+LIVENESS_EVENTS = frozenset(("heartbeat", "phase", "timing", "parse_progress", "worker", "progress"))
+
+# json.dumps builds a fresh JSONEncoder whenever non-default options are
+# passed, so the emitter hot path reuses one configured instance instead.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _format_checkpoint_text(payload: Dict[str, Any]) -> str:
+    detail = payload.get("detail")
+    if detail is not None:
+        return f"CHECKPOINT:{payload.get('code')}:{detail}"
+    return f"CHECKPOINT:{payload.get('code')}"
+
+
+# Legacy text protocol lines for stdout events, keyed by event type so the
+# per-event dispatch is one dict lookup. "error" is handled separately because
+# it goes to stderr.
+_TEXT_EVENT_FORMATTERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "phase": lambda payload: f"PHASE:{payload['phase']}",
+    "metadata": lambda payload: f"METADATA:{payload['key']}:{payload['value']}",
+    "timing": lambda payload: f"TIMING:{payload['chunk_idx']}:{payload['chunk_timing_ms']}",
+    "parse_progress": lambda payload: (
+        "PARSE_PROGRESS:"
+        f"{payload['current_item']}/{payload['total_items']}:"
+        f"{payload['current_chapter_count']}"
+    ),
+    "heartbeat": lambda payload: f"HEARTBEAT:{payload['heartbeat_ts']}",
+    "worker": lambda payload: (
+        f"WORKER:{payload['id']}:{payload['status']}:{payload['details']}"
+    ),
+    "progress": lambda payload: (
+        f"PROGRESS:{payload['current_chunk']}/{payload['total_chunks']} chunks"
+    ),
+    "checkpoint": _format_checkpoint_text,
+    "done": lambda payload: "DONE",
+    "inspection": lambda payload: f"INSPECTION:{_JSON_ENCODER.encode(payload['result'])}",
+}
+
+
+class BufferedEventSink:
+    """Ping-pong line buffer drained to a stream by a dedicated writer thread.
+
+    The producer appends encoded lines to the active buffer and only blocks when
+    it is full. The writer thread swaps buffers and writes everything pending in
+    a single call, so event I/O stays off the inference path.
+    """
+
+    def __init__(
+        self,
+        stream: Any,
+        capacity: int = DEFAULT_EVENT_BUFFER_BYTES,
+        thread_name: str = "event-writer",
+    ):
+        self._stream = stream
+        self._capacity = max(1, capacity)
+        self._buffers = [bytearray(self._capacity), bytearray(self._capacity)]
+        self._active = 0
+        self._filled = 0
+        self._closing = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+        self._fd = self._resolve_fd(stream)
+        self._thread = threading.Thread(
+            target=self._drain_loop,
+            name=thread_name,
+            daemon=True,
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _resolve_fd(stream: Any) -> Optional[int]:
+        try:
+            fd = stream.fileno()
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return None
+        stream.flush()
+        return fd
+
+    def write(self, data: bytes) -> None:
+        size = len(data)
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            if self._closing:
+                raise ValueError("write to closed event sink")
+            while self._filled and self._filled + size > self._capacity:
+                self._cond.notify_all()
+                self._cond.wait()
+                if self._error is not None:
+                    raise self._error
+            buffer = self._buffers[self._active]
+            buffer[self._filled:self._filled + size] = data
+            self._filled += size
+            self._cond.notify_all()
+
+    def _drain_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._filled and not self._closing:
+                    self._cond.wait()
+                if not self._filled:
+                    return
+                buffer = self._buffers[self._active]
+                pending = self._filled
+                self._active ^= 1
+                self._filled = 0
+                self._cond.notify_all()
+
+            try:
+                self._write_out(memoryview(buffer)[:pending])
+            except BaseException as exc:  # pragma: no cover - broken pipe etc.
+                with self._cond:
+                    self._error = exc
+                    self._filled = 0
+                    self._cond.notify_all()
+                return
+            finally:
+                if len(buffer) > self._capacity:
+                    del buffer[self._capacity:]
+
+    def _write_out(self, view: memoryview) -> None:
+        if self._fd is None:
+            self._stream.write(view.tobytes().decode("utf-8"))
+            self._stream.flush()
+            return
+
+        # Anything else printed through the stream is still sitting in its
+        # Python-level buffer; push it out first so lines do not interleave.
+        self._stream.flush()
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
 
 
 class EventEmitter:
-    """Emit progress/log events in legacy text or structured JSON format."""
+    """Emit progress/log events in legacy text or structured JSON format.
+
+    Stdout is flushed per event because it is the live IPC channel. The log file
+    is block-buffered and flushed on LOG_FLUSH_EVENTS, stderr lines, close, and
+    on the first write after LOG_FLUSH_INTERVAL_SECONDS without a flush.
+
+    ``last_liveness_monotonic`` records when the last LIVENESS_EVENTS event was
+    emitted, for the heartbeat worker.
+    """
+
+    last_liveness_monotonic: float
 
     def __init__(
         self,
         event_format: str = "text",
         job_id: str = "job",
         log_file: Optional[str] = None,
+        async_events: bool = False,
     ):
         self.event_format = event_format
         self.job_id = job_id
-        self._log_fp: Optional[TextIO] = None
+        self._json_job_id_field = f', "job_id": {_JSON_ENCODER.encode(job_id)}'
+        self._log_fp: Optional[BinaryIO] = None
         self._write_lock = threading.Lock()
+        self._stdout_sink: Optional[BufferedEventSink] = None
+        self._log_sink: Optional[BufferedEventSink] = None
+        self.last_liveness_monotonic = time.monotonic()
+        self._log_flushed_monotonic = self.last_liveness_monotonic
 
         if log_file:
             log_dir = os.path.dirname(os.path.abspath(log_file))
             if log_dir:
                 os.makedirs(log_dir, exist_ok=True)
-            self._log_fp = open(log_file, "a", encoding="utf-8")
+            self._log_fp = open(log_file, "ab", buffering=LOG_FILE_BUFFER_BYTES)
+
+        if async_events:
+            self._stdout_sink = BufferedEventSink(sys.stdout, thread_name="event-stdout")
+            if self._log_fp is not None:
+                self._log_sink = BufferedEventSink(self._log_fp, thread_name="event-log")
 
     def _write(self, line: str, *, stderr: bool = False) -> None:
         with self._write_lock:
+            now = time.monotonic()
+            text = line + "\n"
+            if self._stdout_sink is not None:
+                encoded = text.encode("utf-8")
+                if stderr:
+                    sys.stderr.write(text)
+                    sys.stderr.flush()
+                else:
+                    self._stdout_sink.write(encoded)
+                if self._log_sink is not None:
+                    self._log_sink.write(encoded)
+                return
+
             stream = sys.stderr if stderr else sys.stdout
-            print(line, file=stream, flush=True)
+            stream.write(text)
+            stream.flush()
             if self._log_fp is not None:
-                self._log_fp.write(line + "\n")
+                self._log_fp.write(text.encode("utf-8"))
+                if stderr or now - self._log_flushed_monotonic >= LOG_FLUSH_INTERVAL_SECONDS:
+                    self._log_fp.flush()
+                    self._log_flushed_monotonic = now
+
+    def flush(self) -> None:
+        with self._write_lock:
+            if self._log_fp is not None and self._log_sink is None:
                 self._log_fp.flush()
+                self._log_flushed_monotonic = time.monotonic()
 
     def close(self) -> None:
+        sinks: List[BufferedEventSink] = [
+            sink for sink in (self._stdout_sink, self._log_sink) if sink is not None
+        ]
+        self._stdout_sink = None
+        self._log_sink = None
+        close_error: Optional[BaseException] = None
+        for sink in sinks:
+            try:
+                sink.close()
+            except BaseException as exc:  # pragma: no cover - broken pipe etc.
+                close_error = close_error or exc
+
         if self._log_fp is not None:
             self._log_fp.close()
             self._log_fp = None
+        if close_error is not None:
+            raise close_error
 
     def _emit_json(self, event_type: str, **payload: Any) -> None:
-        body = {
-            "type": event_type,
-            "ts_ms": int(time.time() * 1000),
-            "job_id": self.job_id,
-            **payload,
-        }
-        self._write(json.dumps(body, ensure_ascii=False))
+        # Only the payload goes through the encoder; the envelope fields are
+        # spliced in front of it with the encoder's own key order and separators.
+        encoded_payload = _JSON_ENCODER.encode(payload) if payload else "{}"
+        separator = ", " if payload else ""
+        self._write(
+            f'{{"type": {_JSON_ENCODER.encode(event_type)}, '
+            f'"ts_ms": {int(time.time() * 1000)}'
+            f"{self._json_job_id_field}{separator}{encoded_payload[1:]}"
+        )
 
     def _emit_text_event(self, event_type: str, payload: Dict[str, Any]) -> None:
-        if event_type == "phase":
-            self._write(f"PHASE:{payload['phase']}")
-            return
-        if event_type == "metadata":
-            self._write(f"METADATA:{payload['key']}:{payload['value']}")
-            return
-        if event_type == "timing":
-            self._write(f"TIMING:{payload['chunk_idx']}:{payload['chunk_timing_ms']}")
-            return
-        if event_type == "parse_progress":
-            self._write(
-                "PARSE_PROGRESS:"
-                f"{payload['current_item']}/{payload['total_items']}:"
-                f"{payload['current_chapter_count']}"
-            )
-            return
-        if event_type == "heartbeat":
-            self._write(f"HEARTBEAT:{payload['heartbeat_ts']}")
-            return
-        if event_type == "worker":
-            self._write(
-                f"WORKER:{payload['id']}:{payload['status']}:{payload['details']}"
-            )
-            return
-        if event_type == "progress":
-            self._write(
-                f"PROGRESS:{payload['current_chunk']}/{payload['total_chunks']} chunks"
-            )
-            return
-        if event_type == "checkpoint":
-            code = payload.get("code")
-            detail = payload.get("detail")
-            if detail is not None:
-                self._write(f"CHECKPOINT:{code}:{detail}")
-            else:
-                self._write(f"CHECKPOINT:{code}")
-            return
-        if event_type == "error":
+        formatter = _TEXT_EVENT_FORMATTERS.get(event_type)
+        if formatter is not None:
+            self._write(formatter(payload))
+        elif event_type == "error":
             self._write(payload["message"], stderr=True)
-            return
-        if event_type == "done":
-            self._write("DONE")
-            return
-        if event_type == "inspection":
-            self._write(f"INSPECTION:{json.dumps(payload['result'], ensure_ascii=False)}")
-            return
 
     def emit(self, event_type: str, **payload: Any) -> None:
         if self.event_format == "json":
             self._emit_json(event_type, **payload)
         else:
             self._emit_text_event(event_type, payload)
+        if event_type in LIVENESS_EVENTS:
+            self.last_liveness_monotonic = time.monotonic()
+        if event_type in LOG_FLUSH_EVENTS:
+            self.flush()
 
     def info(self, message: str) -> None:
         if self.event_format == "json":
@@ -126,11 +303,24 @@ def start_heartbeat_emitter(
     interval_seconds: float = 5.0,
     thread_name: str = "event-heartbeat",
 ) -> Tuple[threading.Event, threading.Thread]:
+    """Emit heartbeats from a background thread whenever liveness events stop.
+
+    The CLI's stall timer is reset only by LIVENESS_EVENTS, so the worker sleeps
+    until ``interval_seconds`` have passed since the last such event instead of
+    emitting on a fixed cadence while parse progress is already flowing. Log and
+    metadata lines do not postpone a heartbeat.
+    """
     stop_event = threading.Event()
 
     def heartbeat_worker() -> None:
-        while not stop_event.wait(interval_seconds):
+        timeout = interval_seconds
+        while not stop_event.wait(timeout):
+            idle = time.monotonic() - events.last_liveness_monotonic
+            if idle < interval_seconds:
+                timeout = interval_seconds - idle
+                continue
             events.emit("heartbeat", heartbeat_ts=int(time.time() * 1000))
+            timeout = interval_seconds
 
     thread = threading.Thread(
         target=heartbeat_worker,
@@ -1,26 +1,37 @@
+import functools
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional
 
 import numpy as np
-from pydub import AudioSegment
 
 from .metadata import _infer_cover_mime_type_from_path
 from .models import BookMetadata, ChapterInfo
 
-try:
-    import torch
-except ImportError:
-    torch = None
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
 DEFAULT_SAMPLE_RATE = 24000
+# Keep ffmpeg's stderr to warnings and errors: no banner and no periodic
+# progress lines, which otherwise grow without bound over long encodes and
+# can fill the pipe of a streaming encoder that is only read at close.
+FFMPEG_GLOBAL_ARGS = ("-hide_banner", "-nostats")
+FFMPEG_ERROR_TAIL_LINES = 64
+# Streaming encoders get a larger stdin buffer so the many small PCM fragments
+# a backend yields are coalesced into fewer pipe writes; fragments bigger than
+# the buffer still go straight through without an extra copy.
+PCM_PIPE_BUFFER_BYTES = 256 * 1024
 
 
 def audio_to_int16(audio) -> np.ndarray:
     """Convert audio tensor/array to int16 numpy array."""
+    # A tensor can only exist if a backend already imported torch, so look it up
+    # instead of paying for the import on metadata/inspection-only runs.
+    torch = sys.modules.get("torch") if not isinstance(audio, np.ndarray) else None
     if torch is not None and isinstance(audio, torch.Tensor):
         if audio.device.type != "cpu":
             audio = audio.detach().cpu()
@@ -31,12 +42,20 @@ def audio_to_int16(audio) -> np.ndarray:
         audio = np.asarray(audio)
 
     if audio.dtype != np.int16:
-        audio = np.clip(audio, -1.0, 1.0)
-        audio = (audio * 32767.0).astype(np.int16)
+        # Scale straight into the int16 result; unsafe casting truncates toward
+        # zero exactly like astype(), without a second float temporary.
+        audio = np.multiply(
+            np.clip(audio, -1.0, 1.0),
+            32767.0,
+            out=np.empty(audio.shape, dtype=np.int16),
+            casting="unsafe",
+        )
     return audio
 
 
-def audio_to_segment(audio: np.ndarray, rate: int = DEFAULT_SAMPLE_RATE) -> AudioSegment:
+def audio_to_segment(audio: np.ndarray, rate: int = DEFAULT_SAMPLE_RATE) -> "AudioSegment":
+    from pydub import AudioSegment
+
     if audio.dtype != np.int16:
         audio = audio_to_int16(audio)
     return AudioSegment(
@@ -47,13 +66,52 @@ def audio_to_segment(audio: np.ndarray, rate: int = DEFAULT_SAMPLE_RATE) -> Audi
     )
 
 
+def write_pcm_chunk(stream: Any, audio: np.ndarray) -> None:
+    """Write a PCM chunk to an ffmpeg stdin or spool file as int16 samples.
+
+    Use this instead of ``stream.write(audio.tobytes())``; the buffer is handed
+    over as a memoryview, so no per-chunk bytes copy is made.
+    """
+    if audio.dtype != np.int16:
+        audio = audio_to_int16(audio)
+    stream.write(_pcm_input_view(audio))
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_ffmpeg_path() -> str:
+    # Successful lookups are cached for the process; a miss raises and is
+    # retried on the next call.
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path is None:
+        raise FileNotFoundError(
+            "ffmpeg not found. Install with: brew install ffmpeg"
+        )
+    return ffmpeg_path
+
+
+def _ffmpeg_failure_message(stderr: Optional[bytes]) -> str:
+    lines = (stderr or b"").decode("utf-8", errors="replace").splitlines()
+    return "ffmpeg failed: " + "\n".join(lines[-FFMPEG_ERROR_TAIL_LINES:])
+
+
+def _pcm_input_view(pcm_data: np.ndarray) -> memoryview:
+    """Return a zero-copy byte view of PCM samples for ffmpeg stdin."""
+    # communicate() writes bytes-like input in pipe-sized slices, so this keeps
+    # peak memory at one copy of the audio instead of tobytes()'s two.
+    return memoryview(np.ascontiguousarray(pcm_data)).cast("B")
+
+
+_FFMETADATA_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "=": "\\=",
+    ";": "\\;",
+    "#": "\\#",
+    "\n": "\\\n",
+})
+
+
 def _escape_ffmetadata(text: str) -> str:
-    text = text.replace("\\", "\\\\")
-    text = text.replace("=", "\\=")
-    text = text.replace(";", "\\;")
-    text = text.replace("#", "\\#")
-    text = text.replace("\n", "\\\n")
-    return text
+    return text.translate(_FFMETADATA_ESCAPES)
 
 
 def generate_ffmetadata(
@@ -80,13 +138,15 @@ def generate_ffmetadata(
     return "\n".join(lines)
 
 
+_COVER_TEMPFILE_SUFFIXES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+}
+
+
 def _cover_tempfile_suffix(metadata: BookMetadata) -> str:
-    if metadata.cover_mime_type:
-        if "png" in metadata.cover_mime_type:
-            return ".png"
-        if "gif" in metadata.cover_mime_type:
-            return ".gif"
-    return ".jpg"
+    return _COVER_TEMPFILE_SUFFIXES.get(metadata.cover_mime_type or "", ".jpg")
 
 
 def _write_ffmetadata_tempfile(
@@ -94,15 +154,13 @@ def _write_ffmetadata_tempfile(
     chapters: List[ChapterInfo],
     sample_rate: int,
 ) -> str:
-    metadata_content = generate_ffmetadata(metadata, chapters, sample_rate)
-    metadata_file = tempfile.NamedTemporaryFile(
-        mode="w",
-        suffix=".txt",
-        delete=False,
-    )
-    metadata_file.write(metadata_content)
-    metadata_file.close()
-    return metadata_file.name
+    metadata_bytes = generate_ffmetadata(metadata, chapters, sample_rate).encode("utf-8")
+    fd, metadata_path = tempfile.mkstemp(suffix=".txt")
+    try:
+        os.write(fd, metadata_bytes)
+    finally:
+        os.close(fd)
+    return metadata_path
 
 
 def _write_cover_tempfile(metadata: BookMetadata) -> Optional[str]:
@@ -118,6 +176,14 @@ def _write_cover_tempfile(metadata: BookMetadata) -> Optional[str]:
     return cover_file.name
 
 
+def _silent_audio_input_args(sample_rate: int) -> List[str]:
+    return [
+        "-f", "lavfi",
+        "-t", "0.1",
+        "-i", f"anullsrc=r={sample_rate}:cl=mono",
+    ]
+
+
 def _build_m4b_ffmpeg_command(
     ffmpeg_path: str,
     audio_input_args: List[str],
@@ -126,9 +192,11 @@ def _build_m4b_ffmpeg_command(
     bitrate: str,
     normalize: bool,
     output_path: str,
+    copy_audio: bool = False,
 ) -> List[str]:
     cmd = [
         ffmpeg_path,
+        *FFMPEG_GLOBAL_ARGS,
         *audio_input_args,
         "-i", metadata_file,
     ]
@@ -148,18 +216,62 @@ def _build_m4b_ffmpeg_command(
             "-disposition:v:0", "attached_pic",
         ])
 
-    if normalize:
-        cmd.extend(["-af", "loudnorm=I=-14:TP=-1:LRA=11"])
+    if copy_audio:
+        cmd.extend(["-c:a", "copy"])
+    else:
+        if normalize:
+            cmd.extend(["-af", "loudnorm=I=-14:TP=-1:LRA=11"])
+        cmd.extend(["-c:a", "aac", "-b:a", bitrate])
 
     cmd.extend([
-        "-c:a", "aac",
-        "-b:a", bitrate,
         "-movflags", "+faststart",
         "-y", output_path,
     ])
     return cmd
 
 
+def _run_m4b_export(
+    ffmpeg_path: str,
+    audio_input_args: List[str],
+    output_path: str,
+    metadata: BookMetadata,
+    chapters: List[ChapterInfo],
+    sample_rate: int,
+    bitrate: str,
+    normalize: bool,
+    copy_audio: bool = False,
+) -> None:
+    temp_files = []
+    try:
+        metadata_file = _write_ffmetadata_tempfile(metadata, chapters, sample_rate)
+        temp_files.append(metadata_file)
+
+        cover_file = _write_cover_tempfile(metadata)
+        if cover_file:
+            temp_files.append(cover_file)
+
+        cmd = _build_m4b_ffmpeg_command(
+            ffmpeg_path,
+            audio_input_args,
+            metadata_file,
+            cover_file,
+            bitrate,
+            normalize,
+            output_path,
+            copy_audio=copy_audio,
+        )
+
+        proc = subprocess.run(cmd, capture_output=True)
+        if proc.returncode != 0:
+            raise RuntimeError(_ffmpeg_failure_message(proc.stderr))
+    finally:
+        for temp_file in temp_files:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+
 def export_pcm_to_mp3(
     pcm_data: np.ndarray,
     output_path: str,
@@ -167,15 +279,12 @@ def export_pcm_to_mp3(
     bitrate: str = "192k",
     normalize: bool = False,
 ) -> None:
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path is None:
-        raise FileNotFoundError(
-            "ffmpeg not found. Install with: brew install ffmpeg"
-        )
+    ffmpeg_path = _resolve_ffmpeg_path()
 
     if pcm_data.size == 0:
         cmd = [
             ffmpeg_path,
+            *FFMPEG_GLOBAL_ARGS,
             "-f", "lavfi",
             "-i", "anullsrc=r=24000:cl=mono",
             "-t", "0.1",
@@ -190,6 +299,7 @@ def export_pcm_to_mp3(
 
     cmd = [
         ffmpeg_path,
+        *FFMPEG_GLOBAL_ARGS,
         "-f", "s16le",
         "-ar", str(sample_rate),
         "-ac", "1",
@@ -204,9 +314,13 @@ def export_pcm_to_mp3(
         "-y", output_path,
     ])
 
-    proc = subprocess.run(cmd, input=pcm_data.tobytes(), capture_output=True)
+    proc = subprocess.run(
+        cmd,
+        input=_pcm_input_view(pcm_data),
+        capture_output=True,
+    )
     if proc.returncode != 0:
-        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode()}")
+        raise RuntimeError(_ffmpeg_failure_message(proc.stderr))
 
 
 def export_pcm_to_m4b(
@@ -218,11 +332,7 @@ def export_pcm_to_m4b(
     bitrate: str = "192k",
     normalize: bool = False,
 ) -> None:
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path is None:
-        raise FileNotFoundError(
-            "ffmpeg not found. Install with: brew install ffmpeg"
-        )
+    ffmpeg_path = _resolve_ffmpeg_path()
 
     if pcm_data.dtype != np.int16:
         pcm_data = audio_to_int16(pcm_data)
@@ -236,11 +346,7 @@ def export_pcm_to_m4b(
             temp_files.append(cover_file)
 
         if pcm_data.size == 0:
-            audio_input_args = [
-                "-f", "lavfi",
-                "-t", "0.1",
-                "-i", f"anullsrc=r={sample_rate}:cl=mono",
-            ]
+            audio_input_args = _silent_audio_input_args(sample_rate)
         else:
             audio_input_args = [
                 "-f", "s16le",
@@ -259,9 +365,13 @@ def export_pcm_to_m4b(
             output_path,
         )
 
-        proc = subprocess.run(cmd, input=pcm_data.tobytes(), capture_output=True)
+        proc = subprocess.run(
+            cmd,
+            input=_pcm_input_view(pcm_data),
+            capture_output=True,
+        )
         if proc.returncode != 0:
-            raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode()}")
+            raise RuntimeError(_ffmpeg_failure_message(proc.stderr))
 
     finally:
         for temp_file in temp_files:
@@ -278,15 +388,12 @@ def export_pcm_file_to_mp3(
     bitrate: str = "192k",
     normalize: bool = False,
 ) -> None:
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path is None:
-        raise FileNotFoundError(
-            "ffmpeg not found. Install with: brew install ffmpeg"
-        )
+    ffmpeg_path = _resolve_ffmpeg_path()
 
     if not os.path.exists(pcm_path) or os.path.getsize(pcm_path) == 0:
         cmd = [
             ffmpeg_path,
+            *FFMPEG_GLOBAL_ARGS,
             "-f", "lavfi",
             "-i", f"anullsrc=r={sample_rate}:cl=mono",
             "-t", "0.1",
@@ -298,6 +405,7 @@ def export_pcm_file_to_mp3(
 
     cmd = [
         ffmpeg_path,
+        *FFMPEG_GLOBAL_ARGS,
         "-f", "s16le",
         "-ar", str(sample_rate),
         "-ac", "1",
@@ -314,7 +422,7 @@ def export_pcm_file_to_mp3(
 
     proc = subprocess.run(cmd, capture_output=True)
     if proc.returncode != 0:
-        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode()}")
+        raise RuntimeError(_ffmpeg_failure_message(proc.stderr))
 
 
 def open_mp3_export_stream(
@@ -323,14 +431,11 @@ def open_mp3_export_stream(
     bitrate: str = "192k",
     normalize: bool = False,
 ) -> subprocess.Popen:
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path is None:
-        raise FileNotFoundError(
-            "ffmpeg not found. Install with: brew install ffmpeg"
-        )
+    ffmpeg_path = _resolve_ffmpeg_path()
 
     cmd = [
         ffmpeg_path,
+        *FFMPEG_GLOBAL_ARGS,
         "-f", "s16le",
         "-ar", str(sample_rate),
         "-ac", "1",
@@ -347,13 +452,15 @@ def open_mp3_export_stream(
 
     return subprocess.Popen(
         cmd,
+        bufsize=PCM_PIPE_BUFFER_BYTES,
         stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
         stderr=subprocess.PIPE,
     )
 
 
-def close_mp3_export_stream(proc: subprocess.Popen) -> None:
+def close_export_stream(proc: subprocess.Popen) -> None:
+    """Close a streaming MP3/AAC encoder and raise if ffmpeg failed."""
     if proc.stdin is not None:
         proc.stdin.close()
     stderr = b""
@@ -361,8 +468,10 @@ def close_mp3_export_stream(proc: subprocess.Popen) -> None:
         stderr = proc.stderr.read()
     return_code = proc.wait()
     if return_code != 0:
-        err = stderr.decode("utf-8", errors="replace")
-        raise RuntimeError(f"ffmpeg failed: {err}")
+        raise RuntimeError(_ffmpeg_failure_message(stderr))
+
+
+close_mp3_export_stream = close_export_stream
 
 
 def export_pcm_file_to_m4b(
@@ -374,53 +483,112 @@ def export_pcm_file_to_m4b(
     bitrate: str = "192k",
     normalize: bool = False,
 ) -> None:
-    ffmpeg_path = shutil.which("ffmpeg")
-    if ffmpeg_path is None:
-        raise FileNotFoundError(
-            "ffmpeg not found. Install with: brew install ffmpeg"
-        )
+    ffmpeg_path = _resolve_ffmpeg_path()
+
+    has_audio = os.path.exists(pcm_path) and os.path.getsize(pcm_path) > 0
+    if has_audio:
+        audio_input_args = [
+            "-f", "s16le",
+            "-ar", str(sample_rate),
+            "-ac", "1",
+            "-i", pcm_path,
+        ]
+    else:
+        audio_input_args = _silent_audio_input_args(sample_rate)
 
-    temp_files = []
-    try:
-        metadata_file = _write_ffmetadata_tempfile(metadata, chapters, sample_rate)
-        temp_files.append(metadata_file)
+    _run_m4b_export(
+        ffmpeg_path,
+        audio_input_args,
+        output_path,
+        metadata,
+        chapters,
+        sample_rate,
+        bitrate,
+        normalize,
+    )
 
-        has_audio = os.path.exists(pcm_path) and os.path.getsize(pcm_path) > 0
-        if has_audio:
-            audio_input_args = [
-                "-f", "s16le",
-                "-ar", str(sample_rate),
-                "-ac", "1",
-                "-i", pcm_path,
-            ]
-        else:
-            audio_input_args = [
-                "-f", "lavfi",
-                "-t", "0.1",
-                "-i", f"anullsrc=r={sample_rate}:cl=mono",
-            ]
 
-        cover_file = _write_cover_tempfile(metadata)
-        if cover_file:
-            temp_files.append(cover_file)
+def open_m4b_export_stream(
+    encoded_audio_path: str,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    bitrate: str = "192k",
+    normalize: bool = False,
+) -> subprocess.Popen:
+    """Start an AAC encoder that consumes PCM on stdin while inference runs.
 
-        cmd = _build_m4b_ffmpeg_command(
+    Chapter offsets are only known once inference finishes, so the encoder writes
+    a chapterless intermediate file that ``finalize_m4b_export_stream`` remuxes.
+    """
+    ffmpeg_path = _resolve_ffmpeg_path()
+
+    cmd = [
+        ffmpeg_path,
+        *FFMPEG_GLOBAL_ARGS,
+        "-f", "s16le",
+        "-ar", str(sample_rate),
+        "-ac", "1",
+        "-i", "pipe:0",
+    ]
+
+    if normalize:
+        cmd.extend(["-af", "loudnorm=I=-14:TP=-1:LRA=11"])
+
+    cmd.extend([
+        "-c:a", "aac",
+        "-b:a", bitrate,
+        "-f", "mp4",
+        "-y", encoded_audio_path,
+    ])
+
+    return subprocess.Popen(
+        cmd,
+        bufsize=PCM_PIPE_BUFFER_BYTES,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+
+def finalize_m4b_export_stream(
+    proc: subprocess.Popen,
+    encoded_audio_path: str,
+    output_path: str,
+    metadata: BookMetadata,
+    chapters: List[ChapterInfo],
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    bitrate: str = "192k",
+    has_audio: bool = True,
+) -> None:
+    """Finish the streamed AAC encode and remux it with chapters and cover art.
+
+    The encoded track is copied as-is; ``bitrate`` only applies to the silent
+    placeholder track written when nothing was encoded.
+    """
+    ffmpeg_path = _resolve_ffmpeg_path()
+
+    close_export_stream(proc)
+
+    if has_audio:
+        _run_m4b_export(
             ffmpeg_path,
-            audio_input_args,
-            metadata_file,
-            cover_file,
+            ["-i", encoded_audio_path],
+            output_path,
+            metadata,
+            chapters,
+            sample_rate,
             bitrate,
-            normalize,
+            normalize=False,
+            copy_audio=True,
+        )
+    else:
+        # Nothing was encoded; write a silent placeholder track instead.
+        _run_m4b_export(
+            ffmpeg_path,
+            _silent_audio_input_args(sample_rate),
             output_path,
+            metadata,
+            chapters,
+            sample_rate,
+            bitrate,
+            normalize=False,
         )
-
-        proc = subprocess.run(cmd, capture_output=True)
-        if proc.returncode != 0:
-            raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode()}")
-    finally:
-        for temp_file in temp_files:
-            try:
-                os.remove(temp_file)
-            except OSError:
-                pass
-
@@ -1,5 +1,6 @@
 import argparse
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any, Callable, Optional
 
 from checkpoint import CheckpointInspection, get_checkpoint_dir, inspect_checkpoint
@@ -115,7 +116,7 @@ def prepare_job(
     parsed_epub = deps.parse_epub(args.input, progress_callback=progress_callback)
     chapters = parsed_epub.chapters
     chunks, chapter_start_indices = deps.split_text_to_chunks(chapters, chunk_chars)
-    total_chars = sum(len(chunk.text) for chunk in chunks)
+    total_chars = sum(map(len, map(attrgetter("text"), chunks)))
 
     if not chunks:
         raise ValueError("No text chunks produced from EPUB.")
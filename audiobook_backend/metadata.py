@@ -1,39 +1,33 @@
 import argparse
+import dataclasses
 import os
 
 from .models import BookMetadata
 
 
+_COVER_MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+}
+
+
 def _infer_cover_mime_type_from_path(cover_path: str) -> str:
     ext = os.path.splitext(cover_path)[1].lower()
-    return {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".gif": "image/gif",
-    }.get(ext, "image/jpeg")
+    return _COVER_MIME_TYPES.get(ext, "image/jpeg")
 
 
 def apply_metadata_overrides(
     base_metadata: BookMetadata,
     args: argparse.Namespace,
 ) -> BookMetadata:
-    book_metadata = base_metadata
+    overrides = {}
 
     if args.title:
-        book_metadata = BookMetadata(
-            title=args.title,
-            author=book_metadata.author,
-            cover_image=book_metadata.cover_image,
-            cover_mime_type=book_metadata.cover_mime_type,
-        )
+        overrides["title"] = args.title
     if args.author:
-        book_metadata = BookMetadata(
-            title=book_metadata.title,
-            author=args.author,
-            cover_image=book_metadata.cover_image,
-            cover_mime_type=book_metadata.cover_mime_type,
-        )
+        overrides["author"] = args.author
     if args.cover:
         cover_path = os.path.abspath(args.cover)
         if not os.path.exists(cover_path):
@@ -41,13 +35,9 @@ def apply_metadata_overrides(
                 f"Cover override file not found: {cover_path}"
             )
         with open(cover_path, "rb") as f:
-            cover_data = f.read()
-        book_metadata = BookMetadata(
-            title=book_metadata.title,
-            author=book_metadata.author,
-            cover_image=cover_data,
-            cover_mime_type=_infer_cover_mime_type_from_path(cover_path),
-        )
-
-    return book_metadata
+            overrides["cover_image"] = f.read()
+        overrides["cover_mime_type"] = _infer_cover_mime_type_from_path(cover_path)
 
+    if not overrides:
+        return base_metadata
+    return dataclasses.replace(base_metadata, **overrides)
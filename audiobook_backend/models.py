@@ -2,13 +2,13 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class TextChunk:
     chapter_title: str
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BookMetadata:
     title: str
     author: str
@@ -16,7 +16,7 @@ class BookMetadata:
     cover_mime_type: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSection:
     title: str
     text: str
@@ -30,7 +30,7 @@ class ParsedEpub:
     chapters: List[ParsedSection]
 
 
-@dataclass
+@dataclass(slots=True)
 class ChapterInfo:
     title: str
     start_sample: int
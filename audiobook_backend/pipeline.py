@@ -1,7 +1,9 @@
+import bisect
+import os
 import queue
 import threading
 import time
-from contextlib import nullcontext
+from contextlib import ExitStack, nullcontext
 from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
@@ -10,7 +12,24 @@ import numpy as np
 from checkpoint import CheckpointState, load_chunk_audio, save_checkpoint, save_chunk_audio
 
 from .events import EventEmitter
-from .export import audio_to_int16
+from .export import audio_to_int16, write_pcm_chunk
+
+HEARTBEAT_INTERVAL_SECONDS = 5.0
+# The spool can reach gigabytes of PCM for a long book; a 1 MiB buffer turns
+# the stream of small fragment writes into few large write() calls.
+SPOOL_WRITE_BUFFER_BYTES = 1024 * 1024
+
+# state.json is rewritten after this many newly completed chunks, or once this
+# much time has passed since the last write, and always when the run stops.
+# Chunk audio is still saved per chunk; a crash only costs re-synthesising the
+# chunks finished since the last state write.
+CHECKPOINT_SAVE_EVERY_CHUNKS = 20
+CHECKPOINT_SAVE_INTERVAL_SECONDS = 30.0
+
+# Initial checkpoint buffer size per input character. Narration runs at roughly
+# 12-15 characters per second at 24 kHz, so this covers a typical chunk at
+# speed 1.0 without growing; np.empty only commits the pages that get written.
+CHECKPOINT_SAMPLES_PER_CHAR = 2048
 
 
 @dataclass
@@ -21,6 +40,74 @@ class PipelineRunResult:
     completed_chunks: list[int]
 
 
+def _checkpoint_save_every() -> int:
+    """Chunks per state.json write; ``AUDIOBOOK_CHECKPOINT_EVERY`` overrides it."""
+    value = os.getenv("AUDIOBOOK_CHECKPOINT_EVERY")
+    if not value:
+        return CHECKPOINT_SAVE_EVERY_CHUNKS
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return CHECKPOINT_SAVE_EVERY_CHUNKS
+
+
+def _record_completed_chunk(state: CheckpointState, idx: int) -> None:
+    """Insert ``idx`` into the state's sorted completed list without re-sorting."""
+    completed = state.completed_chunks
+    pos = bisect.bisect_left(completed, idx)
+    if pos == len(completed) or completed[pos] != idx:
+        completed.insert(pos, idx)
+
+
+def _discard_completed_chunk(state: CheckpointState, idx: int) -> None:
+    completed = state.completed_chunks
+    pos = bisect.bisect_left(completed, idx)
+    if pos < len(completed) and completed[pos] == idx:
+        del completed[pos]
+
+
+class _Int16Accumulator:
+    """Collect int16 fragments into one growable buffer instead of a list + concatenate."""
+
+    def __init__(self, capacity: int) -> None:
+        self._buffer = np.empty(max(1, capacity), dtype=np.int16)
+        self._size = 0
+
+    def append(self, samples: np.ndarray) -> None:
+        end = self._size + len(samples)
+        if end > len(self._buffer):
+            grown = np.empty(max(len(self._buffer) * 2, end), dtype=np.int16)
+            grown[:self._size] = self._buffer[:self._size]
+            self._buffer = grown
+        self._buffer[self._size:end] = samples
+        self._size = end
+
+    def view(self) -> np.ndarray:
+        return self._buffer[:self._size]
+
+
+class _BoundedQueue:
+    """SimpleQueue with a semaphore for backpressure.
+
+    queue.Queue(maxsize=...) serialises every put/get through two Python-level
+    conditions; SimpleQueue is implemented in C and the semaphore only bounds
+    how far the producer can run ahead.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._items: queue.SimpleQueue = queue.SimpleQueue()
+        self._slots = threading.BoundedSemaphore(maxsize)
+
+    def put(self, item: Any) -> None:
+        self._slots.acquire()
+        self._items.put(item)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        item = self._items.get(timeout=timeout)
+        self._slots.release()
+        return item
+
+
 def run_sequential_pipeline(
     *,
     chunks: list[Any],
@@ -31,8 +118,8 @@ def run_sequential_pipeline(
     events: EventEmitter,
     progress: Optional[Any],
     task_id: Optional[Any],
-    use_mp3_stream: bool,
-    mp3_export_proc: Optional[Any],
+    use_export_stream: bool,
+    export_proc: Optional[Any],
     spool_path: Optional[str],
     use_checkpoint: bool,
     resume: bool,
@@ -48,22 +135,56 @@ def run_sequential_pipeline(
     chunk_sample_offsets: list[int] = [0] * total_chunks
     cumulative_samples = 0
     times: list[float] = []
-    last_heartbeat = time.time()
+    next_heartbeat_at = time.monotonic() + HEARTBEAT_INTERVAL_SECONDS
     processed_count = 0
 
     def emit_heartbeat_if_needed() -> None:
-        nonlocal last_heartbeat
-        now = time.time()
-        if now - last_heartbeat >= 5:
-            events.emit("heartbeat", heartbeat_ts=int(now * 1000))
-            last_heartbeat = now
+        nonlocal next_heartbeat_at
+        now = time.monotonic()
+        if now >= next_heartbeat_at:
+            events.emit("heartbeat", heartbeat_ts=int(time.time() * 1000))
+            next_heartbeat_at = now + HEARTBEAT_INTERVAL_SECONDS
+
+    checkpoint_save_every = _checkpoint_save_every()
+    unsaved_checkpoint_changes = 0
+    last_checkpoint_save = time.monotonic()
+
+    def save_checkpoint_state(force: bool = False) -> None:
+        nonlocal unsaved_checkpoint_changes, last_checkpoint_save
+        if checkpoint_state is None or unsaved_checkpoint_changes == 0:
+            return
+        now = time.monotonic()
+        if (
+            not force
+            and unsaved_checkpoint_changes < checkpoint_save_every
+            and now - last_checkpoint_save < CHECKPOINT_SAVE_INTERVAL_SECONDS
+        ):
+            return
+        save_checkpoint_fn(checkpoint_dir, checkpoint_state)
+        unsaved_checkpoint_changes = 0
+        last_checkpoint_save = now
+
+    def save_checkpoint_state_on_exit(exc_type: Any, exc: Any, tb: Any) -> bool:
+        if exc_type is None:
+            save_checkpoint_state(force=True)
+            return False
+        # A failed save must not replace the error that ended the run.
+        try:
+            save_checkpoint_state(force=True)
+        except Exception as save_exc:
+            events.warn(f"Failed to save checkpoint state: {save_exc}")
+        return False
 
     spool_context = (
-        open(spool_path, "wb")
+        open(spool_path, "wb", buffering=SPOOL_WRITE_BUFFER_BYTES)
         if spool_path is not None
         else nullcontext(None)
     )
-    with spool_context as spool:
+    with ExitStack() as stack:
+        # Registered first so it runs last: persist pending checkpoint state
+        # however the loop exits, after the spool file has been closed.
+        stack.push(save_checkpoint_state_on_exit)
+        spool = stack.enter_context(spool_context)
         for idx, chunk in enumerate(chunks):
             chunk_sample_offsets[idx] = cumulative_samples
             reused_checkpoint_audio = False
@@ -74,14 +195,14 @@ def run_sequential_pipeline(
                     if chunk_audio.dtype != np.int16:
                         chunk_audio = audio_to_int16_fn(chunk_audio)
 
-                    if use_mp3_stream:
-                        if mp3_export_proc is None or mp3_export_proc.stdin is None:
-                            raise RuntimeError("MP3 export process is not writable.")
-                        mp3_export_proc.stdin.write(chunk_audio.tobytes())
+                    if use_export_stream:
+                        if export_proc is None or export_proc.stdin is None:
+                            raise RuntimeError("Export stream process is not writable.")
+                        write_pcm_chunk(export_proc.stdin, chunk_audio)
                     else:
                         if spool is None:
                             raise RuntimeError("Spool writer is not available.")
-                        spool.write(chunk_audio.tobytes())
+                        write_pcm_chunk(spool, chunk_audio)
 
                     cumulative_samples += len(chunk_audio)
                     reused_checkpoint_audio = True
@@ -95,8 +216,9 @@ def run_sequential_pipeline(
                 else:
                     completed_chunks.discard(idx)
                     if checkpoint_state is not None:
-                        checkpoint_state.completed_chunks = sorted(completed_chunks)
-                        save_checkpoint_fn(checkpoint_dir, checkpoint_state)
+                        _discard_completed_chunk(checkpoint_state, idx)
+                        unsaved_checkpoint_changes += 1
+                        save_checkpoint_state()
                     events.emit("checkpoint", code="MISSING_AUDIO", detail=idx)
 
             if not reused_checkpoint_audio:
@@ -108,7 +230,13 @@ def run_sequential_pipeline(
                     details=f"Chunk {idx+1}/{total_chunks}",
                 )
 
-                checkpoint_parts: Optional[list[np.ndarray]] = [] if use_checkpoint else None
+                checkpoint_audio = (
+                    _Int16Accumulator(
+                        int(len(chunk.text) * CHECKPOINT_SAMPLES_PER_CHAR / max(speed, 0.1))
+                    )
+                    if use_checkpoint
+                    else None
+                )
                 for audio in backend.generate(
                     text=chunk.text,
                     voice=voice,
@@ -116,32 +244,29 @@ def run_sequential_pipeline(
                     split_pattern=split_pattern,
                 ):
                     int16_audio = audio_to_int16_fn(audio)
-                    if use_mp3_stream:
-                        if mp3_export_proc is None or mp3_export_proc.stdin is None:
-                            raise RuntimeError("MP3 export process is not writable.")
-                        mp3_export_proc.stdin.write(int16_audio.tobytes())
+                    if use_export_stream:
+                        if export_proc is None or export_proc.stdin is None:
+                            raise RuntimeError("Export stream process is not writable.")
+                        write_pcm_chunk(export_proc.stdin, int16_audio)
                     else:
                         if spool is None:
                             raise RuntimeError("Spool writer is not available.")
-                        spool.write(int16_audio.tobytes())
+                        write_pcm_chunk(spool, int16_audio)
                     cumulative_samples += len(int16_audio)
 
-                    if checkpoint_parts is not None:
-                        checkpoint_parts.append(int16_audio)
+                    if checkpoint_audio is not None:
+                        checkpoint_audio.append(int16_audio)
 
                 elapsed = time.perf_counter() - start
                 times.append(elapsed)
 
-                if checkpoint_parts is not None:
-                    if checkpoint_parts:
-                        chunk_audio = np.concatenate(checkpoint_parts)
-                    else:
-                        chunk_audio = np.array([], dtype=np.int16)
-                    save_chunk_audio_fn(checkpoint_dir, idx, chunk_audio)
+                if checkpoint_audio is not None:
+                    save_chunk_audio_fn(checkpoint_dir, idx, checkpoint_audio.view())
                     completed_chunks.add(idx)
                     if checkpoint_state is not None:
-                        checkpoint_state.completed_chunks = sorted(completed_chunks)
-                        save_checkpoint_fn(checkpoint_dir, checkpoint_state)
+                        _record_completed_chunk(checkpoint_state, idx)
+                        unsaved_checkpoint_changes += 1
+                        save_checkpoint_state()
                     events.emit("checkpoint", code="SAVED", detail=idx)
 
                 events.emit(
@@ -182,36 +307,36 @@ def run_overlap3_pipeline(
     events: EventEmitter,
     progress: Optional[Any],
     task_id: Optional[Any],
-    mp3_export_proc: Any,
+    export_proc: Any,
     audio_to_int16_fn: Callable[[Any], np.ndarray] = audio_to_int16,
 ) -> PipelineRunResult:
     total_chunks = len(chunks)
     chunk_sample_offsets: list[int] = [0] * total_chunks
     cumulative_samples = 0
     times: list[float] = []
-    last_heartbeat = time.time()
+    next_heartbeat_at = time.monotonic() + HEARTBEAT_INTERVAL_SECONDS
 
-    if mp3_export_proc is None or mp3_export_proc.stdin is None:
-        raise RuntimeError("MP3 export process is not writable.")
+    if export_proc is None or export_proc.stdin is None:
+        raise RuntimeError("Export stream process is not writable.")
 
-    inference_queue_max = max(2, prefetch_chunks * 2)
-    pcm_queue_max = max(2, pcm_queue_size)
+    # Conversion runs on the inference thread, so one queue now holds what the
+    # separate inference and PCM queues used to buffer between them.
+    pcm_queue_max = max(2, prefetch_chunks * 2) + max(2, pcm_queue_size)
 
-    inference_queue: queue.Queue = queue.Queue(maxsize=inference_queue_max)
-    pcm_queue: queue.Queue = queue.Queue(maxsize=pcm_queue_max)
-    worker_errors: queue.Queue = queue.Queue()
+    pcm_queue = _BoundedQueue(pcm_queue_max)
+    worker_errors: queue.SimpleQueue = queue.SimpleQueue()
 
     def emit_heartbeat_if_needed() -> None:
-        nonlocal last_heartbeat
-        now = time.time()
-        if now - last_heartbeat >= 5:
-            events.emit("heartbeat", heartbeat_ts=int(now * 1000))
-            last_heartbeat = now
+        nonlocal next_heartbeat_at
+        now = time.monotonic()
+        if now >= next_heartbeat_at:
+            events.emit("heartbeat", heartbeat_ts=int(time.time() * 1000))
+            next_heartbeat_at = now + HEARTBEAT_INTERVAL_SECONDS
 
     def inference_worker() -> None:
         try:
             for idx, chunk in enumerate(chunks):
-                inference_queue.put(("start", idx, None))
+                pcm_queue.put(("start", idx, None))
                 start = time.perf_counter()
                 for audio in backend.generate(
                     text=chunk.text,
@@ -219,23 +344,9 @@ def run_overlap3_pipeline(
                     speed=speed,
                     split_pattern=split_pattern,
                 ):
-                    inference_queue.put(("audio", idx, audio))
+                    pcm_queue.put(("audio", idx, audio_to_int16_fn(audio)))
                 infer_ms = int((time.perf_counter() - start) * 1000)
-                inference_queue.put(("done", idx, infer_ms))
-        except Exception as exc:  # pragma: no cover - exercised via integration path
-            worker_errors.put(exc)
-        finally:
-            inference_queue.put(("end", -1, None))
-
-    def convert_worker() -> None:
-        try:
-            while True:
-                kind, idx, payload = inference_queue.get()
-                if kind == "end":
-                    break
-                if kind == "audio":
-                    payload = audio_to_int16_fn(payload)
-                pcm_queue.put((kind, idx, payload))
+                pcm_queue.put(("done", idx, infer_ms))
         except Exception as exc:  # pragma: no cover - exercised via integration path
             worker_errors.put(exc)
         finally:
@@ -244,11 +355,7 @@ def run_overlap3_pipeline(
     infer_thread = threading.Thread(
         target=inference_worker, name="tts-infer", daemon=True
     )
-    convert_thread = threading.Thread(
-        target=convert_worker, name="tts-convert", daemon=True
-    )
     infer_thread.start()
-    convert_thread.start()
 
     chunk_started = [False] * total_chunks
     processed_count = 0
@@ -269,6 +376,16 @@ def run_overlap3_pipeline(
             if idx < 0 or idx >= total_chunks:
                 raise RuntimeError(f"Invalid chunk index from overlap3 pipeline: {idx}")
 
+            # Audio fragments far outnumber the other messages, so test for them first.
+            if kind == "audio":
+                if not chunk_started[idx]:
+                    chunk_sample_offsets[idx] = cumulative_samples
+                    chunk_started[idx] = True
+                int16_audio = payload
+                write_pcm_chunk(export_proc.stdin, int16_audio)
+                cumulative_samples += len(int16_audio)
+                continue
+
             if kind == "start":
                 chunk_sample_offsets[idx] = cumulative_samples
                 chunk_started[idx] = True
@@ -280,15 +397,6 @@ def run_overlap3_pipeline(
                 )
                 continue
 
-            if kind == "audio":
-                if not chunk_started[idx]:
-                    chunk_sample_offsets[idx] = cumulative_samples
-                    chunk_started[idx] = True
-                int16_audio = payload
-                mp3_export_proc.stdin.write(int16_audio.tobytes())
-                cumulative_samples += len(int16_audio)
-                continue
-
             if kind == "done":
                 infer_ms = int(payload)
                 times.append(infer_ms / 1000.0)
@@ -322,7 +430,6 @@ def run_overlap3_pipeline(
             raise worker_errors.get()
     finally:
         infer_thread.join(timeout=2)
-        convert_thread.join(timeout=2)
 
     return PipelineRunResult(
         chunk_sample_offsets=chunk_sample_offsets,
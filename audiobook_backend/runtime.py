@@ -1,4 +1,5 @@
 import argparse
+import functools
 import importlib.util
 import os
 import platform
@@ -19,6 +20,8 @@ DEFAULT_CHUNK_CHARS = {
 }
 
 _AUTO_BACKEND_CACHE: Optional[str] = None
+# The host platform cannot change during a run, so resolve it once at import.
+_IS_APPLE_SILICON_HOST = sys.platform == "darwin" and platform.machine() == "arm64"
 
 
 def _parse_env_bool(value: Optional[str]) -> Optional[bool]:
@@ -33,10 +36,12 @@ def _parse_env_bool(value: Optional[str]) -> Optional[bool]:
 
 
 def is_apple_silicon_host() -> bool:
-    return sys.platform == "darwin" and platform.machine() == "arm64"
+    return _IS_APPLE_SILICON_HOST
 
 
+@functools.lru_cache(maxsize=1)
 def _get_macos_total_memory_bytes() -> Optional[int]:
+    """Return physical memory from ``sysctl``; probed once per process."""
     if sys.platform != "darwin":
         return None
 
@@ -116,6 +121,37 @@ def default_pipeline_mode(output_format: str, use_checkpoint: bool) -> str:
     return "sequential"
 
 
+def _mlx_runtime_available() -> bool:
+    """Check that MLX imports and can allocate an array.
+
+    The check runs in-process so auto-detection doesn't pay for a second
+    interpreter start. Set ``AUDIOBOOK_SAFE_MLX_PROBE=1`` to run it in a child
+    process instead, so a native crash inside MLX falls back to PyTorch rather
+    than taking the CLI down with it.
+    """
+    if _parse_env_bool(os.getenv("AUDIOBOOK_SAFE_MLX_PROBE")):
+        try:
+            probe = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import mlx.core as mx; mx.array([1.0]); print('ok')",
+                ],
+                capture_output=True,
+                timeout=8,
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return probe.returncode == 0
+
+    try:
+        mx = importlib.import_module("mlx.core")
+        mx.array([1.0])
+    except Exception:
+        return False
+    return True
+
+
 def resolve_backend(backend: str) -> str:
     """Resolve backend selection, supporting auto-detection on Apple Silicon."""
     global _AUTO_BACKEND_CACHE
@@ -135,21 +171,8 @@ def resolve_backend(backend: str) -> str:
             _AUTO_BACKEND_CACHE = "pytorch"
             return _AUTO_BACKEND_CACHE
 
-        try:
-            probe = subprocess.run(
-                [
-                    sys.executable,
-                    "-c",
-                    "import mlx.core as mx; mx.array([1.0]); print('ok')",
-                ],
-                capture_output=True,
-                timeout=8,
-            )
-            if probe.returncode == 0:
-                _AUTO_BACKEND_CACHE = "mlx"
-                return _AUTO_BACKEND_CACHE
-        except subprocess.TimeoutExpired:
-            _AUTO_BACKEND_CACHE = "pytorch"
+        if _mlx_runtime_available():
+            _AUTO_BACKEND_CACHE = "mlx"
             return _AUTO_BACKEND_CACHE
 
     _AUTO_BACKEND_CACHE = "pytorch"
@@ -1,11 +1,35 @@
 """PyTorch-based Kokoro TTS backend."""
 
-from typing import Generator
+import functools
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, Generator
 import numpy as np
 
 from .base import TTSBackend
 
 
+@dataclass(frozen=True)
+class _TorchCaps:
+    """Accelerator capabilities of the installed torch build."""
+
+    has_cuda: bool
+    has_mps: bool
+    has_mps_empty_cache: bool
+
+
+@functools.lru_cache(maxsize=1)
+def _torch_caps() -> _TorchCaps:
+    """Return torch's accelerator capabilities; probed once per process."""
+    import torch
+
+    return _TorchCaps(
+        has_cuda=torch.cuda.is_available(),
+        has_mps=hasattr(torch.backends, "mps") and torch.backends.mps.is_available(),
+        has_mps_empty_cache=hasattr(torch, "mps") and hasattr(torch.mps, "empty_cache"),
+    )
+
+
 class KokoroPyTorchBackend(TTSBackend):
     """TTS backend using the Kokoro library with PyTorch.
 
@@ -14,10 +38,17 @@ class KokoroPyTorchBackend(TTSBackend):
     for GPU acceleration.
     """
 
+    # Loaded models keyed by device, shared by every instance so a re-initialize
+    # (or a second backend in the same process) skips the weight load and upload.
+    _model_cache: Dict[str, Any] = {}
+
     def __init__(self):
         self._pipeline = None
         self._model = None
+        self._caps = None
         self._sample_rate = 24000
+        # Replaced by torch.inference_mode once initialize() has imported torch.
+        self._inference_mode = nullcontext
 
     @property
     def name(self) -> str:
@@ -37,9 +68,11 @@ class KokoroPyTorchBackend(TTSBackend):
         from kokoro import KModel, KPipeline
         import torch
 
+        self._inference_mode = torch.inference_mode
+        self._caps = _torch_caps()
         resolved_device = device
         if resolved_device == "auto":
-            if hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
+            if self._caps.has_mps:
                 resolved_device = "mps"
             else:
                 self._model = None
@@ -47,20 +80,32 @@ class KokoroPyTorchBackend(TTSBackend):
                 return
 
         if resolved_device == "mps":
-            if not hasattr(torch.backends, "mps") or not torch.backends.mps.is_available():
+            if not self._caps.has_mps:
                 raise RuntimeError("MPS requested but not available")
-            self._model = KModel().to("mps").eval()
+            self._model = self._load_model(KModel, "mps")
             self._pipeline = KPipeline(lang_code=lang_code, model=self._model)
             return
 
         if resolved_device == "cpu":
-            self._model = KModel().to("cpu").eval()
+            self._model = self._load_model(KModel, "cpu")
             self._pipeline = KPipeline(lang_code=lang_code, model=self._model)
             return
 
         self._model = None
         self._pipeline = KPipeline(lang_code=lang_code)
 
+    @classmethod
+    def _load_model(cls, model_class: Any, device: str) -> Any:
+        model = cls._model_cache.get(device)
+        if model is None:
+            model = cls._model_cache[device] = model_class().to(device).eval()
+        return model
+
+    @classmethod
+    def clear_model_cache(cls) -> None:
+        """Drop cached models so their weights can be freed."""
+        cls._model_cache.clear()
+
     def generate(
         self,
         text: str,
@@ -82,24 +127,40 @@ class KokoroPyTorchBackend(TTSBackend):
         if self._pipeline is None:
             raise RuntimeError("Backend not initialized. Call initialize() first.")
 
-        generator = self._pipeline(
+        generator = iter(self._pipeline(
             text, voice=voice, speed=speed, split_pattern=split_pattern
-        )
-        for _, _, audio in generator:
+        ))
+        # Enter inference mode only while the pipeline computes the next segment,
+        # so it does not stay switched on in the caller's thread across yields.
+        while True:
+            with self._inference_mode():
+                result = next(generator, None)
+            if result is None:
+                return
+            _, _, audio = result
             yield audio
 
     def cleanup(self) -> None:
-        """Release PyTorch resources."""
+        """Release PyTorch resources.
+
+        Only references are dropped; loaded models stay in the class-level
+        cache until ``clear_model_cache`` is called. Emptying the CUDA/MPS
+        allocator cache here would force a device synchronize right before the
+        process exits and the driver reclaims the memory anyway; long-lived
+        callers that reuse the process can call ``release_device_cache``.
+        """
         self._pipeline = None
         self._model = None
-        # Optionally clear CUDA/MPS cache
+
+    def release_device_cache(self) -> None:
+        """Return cached CUDA/MPS allocator blocks to the driver."""
         try:
             import torch
 
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-                if hasattr(torch, "mps") and hasattr(torch.mps, "empty_cache"):
-                    torch.mps.empty_cache()
+            caps = self._caps or _torch_caps()
         except ImportError:
-            pass
+            return
+        if caps.has_cuda:
+            torch.cuda.empty_cache()
+        elif caps.has_mps and caps.has_mps_empty_cache:
+            torch.mps.empty_cache()
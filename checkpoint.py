@@ -88,6 +88,20 @@ def save_chunk_audio(checkpoint_dir: str, chunk_idx: int, audio: np.ndarray) ->
     np.save(chunk_path, audio)
 
 
+def _chunk_audio_readable(checkpoint_dir: str, chunk_idx: int) -> bool:
+    """Check that a chunk's saved audio can be loaded, without reading its samples."""
+    chunk_path = os.path.join(checkpoint_dir, f'chunk_{chunk_idx:06d}.npy')
+    if not os.path.exists(chunk_path):
+        return False
+    try:
+        # Memory-mapping parses the header and checks the file is long enough for
+        # the declared shape, which is what a full np.load would trip over.
+        np.load(chunk_path, mmap_mode='r')
+    except (IOError, ValueError):
+        return False
+    return True
+
+
 def load_chunk_audio(checkpoint_dir: str, chunk_idx: int) -> Optional[np.ndarray]:
     """Load a single chunk's audio data from the checkpoint directory."""
     chunk_path = os.path.join(checkpoint_dir, f'chunk_{chunk_idx:06d}.npy')
@@ -172,7 +186,7 @@ def inspect_checkpoint(
     missing_audio_chunks = [
         chunk_idx
         for chunk_idx in state.completed_chunks
-        if load_chunk_audio(checkpoint_dir, chunk_idx) is None
+        if not _chunk_audio_readable(checkpoint_dir, chunk_idx)
     ]
     usable_completed = len(state.completed_chunks) - len(missing_audio_chunks)
 
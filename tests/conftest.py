@@ -12,6 +12,24 @@ import numpy as np
 # Add the project root to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from audiobook_backend.export import _resolve_ffmpeg_path
+
+
+@pytest.fixture(autouse=True)
+def reset_ffmpeg_path_cache():
+    """Drop the cached ffmpeg lookup so each test sees its own shutil.which patch."""
+    _resolve_ffmpeg_path.cache_clear()
+    yield
+    _resolve_ffmpeg_path.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def pcm_test_buffer():
+    """Two seconds of deterministic full-range int16 PCM, shared read-only."""
+    pcm = np.random.default_rng(0).integers(-32768, 32767, size=48000, dtype=np.int16)
+    pcm.setflags(write=False)
+    return pcm
+
 
 @pytest.fixture
 def temp_dir():
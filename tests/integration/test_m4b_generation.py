@@ -99,7 +99,7 @@ class TestM4BGeneration:
         assert "END=2880000" in result
 
     @pytest.mark.slow
-    def test_m4b_export_with_mock_ffmpeg(self, temp_dir):
+    def test_m4b_export_with_mock_ffmpeg(self, temp_dir, pcm_test_buffer):
         """Test M4B export pipeline with mocked ffmpeg."""
         with patch("shutil.which") as mock_which:
             mock_which.return_value = "/usr/bin/ffmpeg"
@@ -108,7 +108,7 @@ class TestM4BGeneration:
                 mock_run.return_value = MagicMock(returncode=0, stderr=b"")
 
                 # Create test data
-                pcm_data = np.random.randint(-32768, 32767, size=48000, dtype=np.int16)
+                pcm_data = pcm_test_buffer
                 output_path = f"{temp_dir}/test.m4b"
                 metadata = BookMetadata(
                     title="Test Book",
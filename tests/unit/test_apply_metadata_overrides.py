@@ -39,6 +39,31 @@ class TestApplyMetadataOverrides:
         assert result.title == "EPUB Title"
         assert result.author == "CLI Author"
 
+    def test_no_overrides_returns_base_metadata(self):
+        metadata = BookMetadata(title="EPUB Title", author="EPUB Author", cover_image=b"img")
+
+        assert apply_metadata_overrides(metadata, build_args()) is metadata
+
+    def test_combined_overrides_keep_base_cover(self):
+        metadata = BookMetadata(
+            title="EPUB Title",
+            author="EPUB Author",
+            cover_image=b"img",
+            cover_mime_type="image/png",
+        )
+
+        result = apply_metadata_overrides(
+            metadata, build_args(title="CLI Title", author="CLI Author")
+        )
+
+        assert result == BookMetadata(
+            title="CLI Title",
+            author="CLI Author",
+            cover_image=b"img",
+            cover_mime_type="image/png",
+        )
+        assert metadata.title == "EPUB Title"
+
     @pytest.mark.parametrize(
         ("extension", "expected_mime"),
         [
@@ -45,6 +45,16 @@ class TestAudioToInt16:
         # All values should be clipped to -32767
         assert all(r == -32767 for r in result)
 
+    def test_float_input_is_not_modified(self):
+        """Conversion should not clip or scale the caller's buffer in place."""
+        audio = np.array([1.5, -0.25, 0.75], dtype=np.float32)
+        original = audio.copy()
+
+        result = audio_to_int16(audio)
+
+        np.testing.assert_array_equal(audio, original)
+        np.testing.assert_array_equal(result, np.array([32767, -8191, 24575], dtype=np.int16))
+
     def test_int16_passthrough(self):
         """Int16 arrays should pass through unchanged."""
         audio = np.array([0, 16383, -16383, 32767, -32767], dtype=np.int16)
@@ -188,6 +188,40 @@ def test_inspect_checkpoint_counts_missing_audio_chunks_as_regeneratable(temp_di
     assert inspection.missing_audio_chunks == [1]
 
 
+@pytest.mark.unit
+def test_inspect_checkpoint_counts_truncated_audio_chunks_as_missing(temp_dir):
+    epub_path = f"{temp_dir}/book.epub"
+    checkpoint_dir = f"{temp_dir}/book.mp3.checkpoint"
+
+    with open(epub_path, "wb") as f:
+        f.write(b"dummy-epub")
+
+    from checkpoint import compute_epub_hash
+
+    state = CheckpointState(
+        epub_hash=compute_epub_hash(epub_path),
+        config={"voice": "af_heart"},
+        total_chunks=3,
+        completed_chunks=[0, 1, 2],
+        chapter_start_indices=[(0, "Chapter 1")],
+    )
+    save_checkpoint(checkpoint_dir, state)
+    save_chunk_audio(checkpoint_dir, 0, np.arange(100, dtype=np.int16))
+    save_chunk_audio(checkpoint_dir, 1, np.arange(100, dtype=np.int16))
+    save_chunk_audio(checkpoint_dir, 2, np.array([], dtype=np.int16))
+    truncated_path = f"{checkpoint_dir}/chunk_000001.npy"
+    with open(truncated_path, "rb") as f:
+        data = f.read()
+    with open(truncated_path, "wb") as f:
+        f.write(data[:-20])
+
+    inspection = inspect_checkpoint(checkpoint_dir, epub_path, state.config)
+
+    assert inspection.resume_compatible is True
+    assert inspection.completed_chunks == 2
+    assert inspection.missing_audio_chunks == [1]
+
+
 @pytest.mark.unit
 def test_resume_reuses_saved_chunk_audio_in_order(temp_dir):
     epub_path = f"{temp_dir}/book.epub"
@@ -248,3 +282,218 @@ def test_resume_reuses_saved_chunk_audio_in_order(temp_dir):
 
     mock_load_chunk.assert_called_once()
     mock_export.assert_called_once()
+
+
+def _run_sequential(temp_dir, **overrides):
+    from audiobook_backend.pipeline import run_sequential_pipeline
+
+    kwargs = dict(
+        voice="af_heart",
+        speed=1.0,
+        split_pattern=r"\n+",
+        events=MagicMock(),
+        progress=None,
+        task_id=None,
+        use_export_stream=False,
+        export_proc=None,
+        spool_path=f"{temp_dir}/spool.pcm",
+        use_checkpoint=True,
+        resume=False,
+        checkpoint_dir=f"{temp_dir}/book.mp3.checkpoint",
+        completed_chunks=set(),
+        checkpoint_state=None,
+        save_chunk_audio_fn=lambda *_args: None,
+        save_checkpoint_fn=lambda *_args: None,
+    )
+    kwargs.update(overrides)
+    return run_sequential_pipeline(**kwargs)
+
+
+@pytest.mark.unit
+def test_sequential_pipeline_keeps_checkpoint_completed_chunks_sorted(temp_dir, monkeypatch):
+    monkeypatch.setenv("AUDIOBOOK_CHECKPOINT_EVERY", "1")
+    checkpoint_state = CheckpointState(
+        epub_hash="hash",
+        config={},
+        total_chunks=4,
+        completed_chunks=[0, 2],
+        chapter_start_indices=[(0, "Chapter 1")],
+    )
+    backend = MagicMock()
+    backend.generate.side_effect = lambda **_kwargs: [np.array([0.1, -0.1], dtype=np.float32)]
+    saved_snapshots = []
+
+    result = _run_sequential(
+        temp_dir,
+        chunks=[TextChunk("Chapter 1", f"chunk {idx}") for idx in range(4)],
+        backend=backend,
+        resume=True,
+        completed_chunks={0, 2},
+        checkpoint_state=checkpoint_state,
+        load_chunk_audio_fn=lambda _dir, idx: (
+            np.array([1, 2], dtype=np.int16) if idx == 0 else None
+        ),
+        save_checkpoint_fn=lambda _dir, state: saved_snapshots.append(
+            list(state.completed_chunks)
+        ),
+    )
+
+    assert saved_snapshots == [[0, 1, 2], [0, 1], [0, 1, 2], [0, 1, 2, 3]]
+    assert checkpoint_state.completed_chunks == [0, 1, 2, 3]
+    assert result.completed_chunks == [0, 1, 2, 3]
+
+
+@pytest.mark.unit
+def test_sequential_pipeline_saves_all_fragments_of_a_chunk(temp_dir, monkeypatch):
+    from audiobook_backend import pipeline
+
+    # Start from a tiny buffer so the checkpoint accumulator has to grow.
+    monkeypatch.setattr(pipeline, "CHECKPOINT_SAMPLES_PER_CHAR", 2)
+    backend = MagicMock()
+    backend.generate.side_effect = lambda **_kwargs: [
+        np.array([1, 2, 3], dtype=np.int16),
+        np.array([], dtype=np.int16),
+        np.arange(4, 40, dtype=np.int16),
+    ]
+    saved_audio = {}
+
+    _run_sequential(
+        temp_dir,
+        chunks=[TextChunk("Chapter 1", "x"), TextChunk("Chapter 1", "y")],
+        backend=backend,
+        save_chunk_audio_fn=lambda _dir, idx, audio: saved_audio.setdefault(idx, audio.copy()),
+    )
+
+    expected = np.arange(1, 40, dtype=np.int16)
+    assert sorted(saved_audio) == [0, 1]
+    for audio in saved_audio.values():
+        assert audio.dtype == np.int16
+        np.testing.assert_array_equal(audio, expected)
+
+
+@pytest.mark.unit
+def test_sequential_pipeline_batches_checkpoint_state_saves(temp_dir, monkeypatch):
+    monkeypatch.setenv("AUDIOBOOK_CHECKPOINT_EVERY", "2")
+    checkpoint_state = CheckpointState(
+        epub_hash="hash",
+        config={},
+        total_chunks=5,
+        completed_chunks=[],
+        chapter_start_indices=[(0, "Chapter 1")],
+    )
+    backend = MagicMock()
+    backend.generate.side_effect = lambda **_kwargs: [np.array([0.1], dtype=np.float32)]
+    saved_snapshots = []
+    saved_chunks = []
+
+    _run_sequential(
+        temp_dir,
+        chunks=[TextChunk("Chapter 1", f"chunk {idx}") for idx in range(5)],
+        backend=backend,
+        checkpoint_state=checkpoint_state,
+        save_chunk_audio_fn=lambda _dir, idx, _audio: saved_chunks.append(idx),
+        save_checkpoint_fn=lambda _dir, state: saved_snapshots.append(
+            list(state.completed_chunks)
+        ),
+    )
+
+    assert saved_chunks == [0, 1, 2, 3, 4]
+    assert saved_snapshots == [[0, 1], [0, 1, 2, 3], [0, 1, 2, 3, 4]]
+
+
+@pytest.mark.unit
+def test_sequential_pipeline_saves_pending_checkpoint_state_on_failure(temp_dir, monkeypatch):
+    monkeypatch.delenv("AUDIOBOOK_CHECKPOINT_EVERY", raising=False)
+    checkpoint_state = CheckpointState(
+        epub_hash="hash",
+        config={},
+        total_chunks=3,
+        completed_chunks=[],
+        chapter_start_indices=[(0, "Chapter 1")],
+    )
+
+    def generate(text, **_kwargs):
+        if text == "chunk 2":
+            raise RuntimeError("backend crashed")
+        return [np.array([0.1], dtype=np.float32)]
+
+    backend = MagicMock()
+    backend.generate.side_effect = generate
+    saved_snapshots = []
+
+    with pytest.raises(RuntimeError, match="backend crashed"):
+        _run_sequential(
+            temp_dir,
+            chunks=[TextChunk("Chapter 1", f"chunk {idx}") for idx in range(3)],
+            backend=backend,
+            checkpoint_state=checkpoint_state,
+            save_checkpoint_fn=lambda _dir, state: saved_snapshots.append(
+                list(state.completed_chunks)
+            ),
+        )
+
+    assert saved_snapshots == [[0, 1]]
+
+
+@pytest.mark.unit
+def test_sequential_pipeline_failed_exit_save_keeps_original_error(temp_dir, monkeypatch):
+    monkeypatch.delenv("AUDIOBOOK_CHECKPOINT_EVERY", raising=False)
+    checkpoint_state = CheckpointState(
+        epub_hash="hash",
+        config={},
+        total_chunks=2,
+        completed_chunks=[],
+        chapter_start_indices=[(0, "Chapter 1")],
+    )
+
+    def generate(text, **_kwargs):
+        if text == "chunk 1":
+            raise RuntimeError("backend crashed")
+        return [np.array([0.1], dtype=np.float32)]
+
+    backend = MagicMock()
+    backend.generate.side_effect = generate
+    events = MagicMock()
+
+    def save_checkpoint_fn(*_args):
+        raise OSError("No space left on device")
+
+    with pytest.raises(RuntimeError, match="backend crashed"):
+        _run_sequential(
+            temp_dir,
+            chunks=[TextChunk("Chapter 1", f"chunk {idx}") for idx in range(2)],
+            backend=backend,
+            events=events,
+            checkpoint_state=checkpoint_state,
+            save_checkpoint_fn=save_checkpoint_fn,
+        )
+
+    events.warn.assert_called_once_with(
+        "Failed to save checkpoint state: No space left on device"
+    )
+
+
+@pytest.mark.unit
+def test_sequential_pipeline_raises_save_error_on_normal_exit(temp_dir, monkeypatch):
+    monkeypatch.delenv("AUDIOBOOK_CHECKPOINT_EVERY", raising=False)
+    checkpoint_state = CheckpointState(
+        epub_hash="hash",
+        config={},
+        total_chunks=1,
+        completed_chunks=[],
+        chapter_start_indices=[(0, "Chapter 1")],
+    )
+    backend = MagicMock()
+    backend.generate.side_effect = lambda **_kwargs: [np.array([0.1], dtype=np.float32)]
+
+    def save_checkpoint_fn(*_args):
+        raise OSError("No space left on device")
+
+    with pytest.raises(OSError, match="No space left"):
+        _run_sequential(
+            temp_dir,
+            chunks=[TextChunk("Chapter 1", "chunk 0")],
+            backend=backend,
+            checkpoint_state=checkpoint_state,
+            save_checkpoint_fn=save_checkpoint_fn,
+        )
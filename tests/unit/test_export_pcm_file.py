@@ -1,10 +1,10 @@
 """Tests for file-based PCM export helpers."""
 
+import struct
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-import numpy as np
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -24,9 +24,8 @@ class TestExportPcmFile:
     def test_mp3_export_uses_pcm_file_input(self, temp_dir):
         pcm_path = f"{temp_dir}/input.pcm"
         output_path = f"{temp_dir}/output.mp3"
-        pcm = np.array([0, 16383, -16383], dtype=np.int16)
         with open(pcm_path, "wb") as f:
-            f.write(pcm.tobytes())
+            f.write(struct.pack("<3h", 0, 16383, -16383))
 
         with patch("shutil.which", return_value="/usr/bin/ffmpeg"):
             with patch("subprocess.run") as mock_run:
@@ -43,9 +42,8 @@ class TestExportPcmFile:
     def test_m4b_export_keeps_metadata_and_cover(self, temp_dir):
         pcm_path = f"{temp_dir}/input.pcm"
         output_path = f"{temp_dir}/output.m4b"
-        pcm = np.array([0, 16383, -16383], dtype=np.int16)
         with open(pcm_path, "wb") as f:
-            f.write(pcm.tobytes())
+            f.write(struct.pack("<3h", 0, 16383, -16383))
 
         metadata = BookMetadata(
             title="Book",
@@ -71,7 +69,7 @@ class TestExportPcmFile:
         pcm_path = f"{temp_dir}/input.pcm"
         output_path = f"{temp_dir}/output.m4b"
         with open(pcm_path, "wb") as f:
-            f.write(np.array([0, 1000], dtype=np.int16).tobytes())
+            f.write(struct.pack("<2h", 0, 1000))
 
         metadata = BookMetadata(title="Book", author="Author")
 
@@ -102,7 +100,7 @@ class TestExportPcmFile:
         pcm_path = f"{temp_dir}/input.pcm"
         output_path = f"{temp_dir}/output.m4b"
         with open(pcm_path, "wb") as f:
-            f.write(np.array([0, 1000], dtype=np.int16).tobytes())
+            f.write(struct.pack("<2h", 0, 1000))
 
         metadata = BookMetadata(title="Book", author="Author")
 
@@ -128,7 +126,7 @@ class TestExportPcmFile:
         pcm_path = f"{temp_dir}/input.pcm"
         output_path = f"{temp_dir}/output.m4b"
         with open(pcm_path, "wb") as f:
-            f.write(np.array([0, 1000], dtype=np.int16).tobytes())
+            f.write(struct.pack("<2h", 0, 1000))
 
         metadata = BookMetadata(
             title="Book",
@@ -158,7 +156,7 @@ class TestExportPcmFile:
         pcm_path = f"{temp_dir}/input.pcm"
         output_path = f"{temp_dir}/output.m4b"
         with open(pcm_path, "wb") as f:
-            f.write(np.array([0, 1000], dtype=np.int16).tobytes())
+            f.write(struct.pack("<2h", 0, 1000))
 
         metadata = BookMetadata(title="Book", author="Author")
 
@@ -29,7 +29,8 @@ class TestExtractEpubMetadata:
             mock_cover = MagicMock()
             mock_cover.get_content.return_value = b'\x89PNG\r\n\x1a\n'
             mock_cover.media_type = 'image/png'
-            mock_book.get_items_of_type.return_value = [mock_cover]
+            mock_cover.get_type.return_value = app_module.ebooklib.ITEM_COVER
+            mock_book.get_items.return_value = [mock_cover]
 
             mock_epub.read_epub.return_value = mock_book
 
@@ -113,21 +114,16 @@ class TestExtractEpubMetadata:
                 ('OPF', 'cover'): [],
             }.get((ns, key), [])
 
-            # No ITEM_COVER
-            def get_items_of_type_side_effect(item_type):
-                if item_type == app_module.ebooklib.ITEM_COVER:
-                    return []
-                elif item_type == app_module.ebooklib.ITEM_IMAGE:
-                    # Return image with "cover" in name
-                    mock_img = MagicMock()
-                    mock_img.get_name.return_value = 'images/cover.jpg'
-                    mock_img.get_content.return_value = b'fake_jpg_data'
-                    mock_img.media_type = 'image/jpeg'
-                    return [mock_img]
-                return []
-
-            mock_book.get_items_of_type.side_effect = get_items_of_type_side_effect
-            mock_book.get_items.return_value = []
+            # No ITEM_COVER; only an image with "cover" in its name
+            mock_other = MagicMock()
+            mock_other.get_type.return_value = app_module.ebooklib.ITEM_IMAGE
+            mock_other.get_name.return_value = 'images/figure1.jpg'
+            mock_img = MagicMock()
+            mock_img.get_type.return_value = app_module.ebooklib.ITEM_IMAGE
+            mock_img.get_name.return_value = 'images/cover.jpg'
+            mock_img.get_content.return_value = b'fake_jpg_data'
+            mock_img.media_type = 'image/jpeg'
+            mock_book.get_items.return_value = [mock_other, mock_img]
 
             mock_epub.read_epub.return_value = mock_book
 
@@ -136,6 +132,35 @@ class TestExtractEpubMetadata:
             assert result.cover_image == b'fake_jpg_data'
             assert result.cover_mime_type == 'image/jpeg'
 
+    def test_cover_item_wins_over_earlier_fallbacks_in_one_manifest_walk(self):
+        """ITEM_COVER should take precedence even when listed after other candidates."""
+        with patch("app.epub") as mock_epub:
+            mock_book = MagicMock()
+            mock_book.get_metadata.side_effect = lambda ns, key: {
+                ('DC', 'title'): [('Book', {})],
+                ('DC', 'creator'): [('Author', {})],
+                ('OPF', 'cover'): [('', {'content': 'opf-cover'})],
+            }.get((ns, key), [])
+
+            opf_item = MagicMock()
+            opf_item.get_type.return_value = app_module.ebooklib.ITEM_IMAGE
+            opf_item.get_id.return_value = 'opf-cover'
+            opf_item.get_content.return_value = b'opf'
+            cover_item = MagicMock()
+            cover_item.get_type.return_value = app_module.ebooklib.ITEM_COVER
+            cover_item.get_content.return_value = b'cover'
+            cover_item.media_type = 'image/png'
+            mock_book.get_items.return_value = [opf_item, cover_item]
+
+            mock_epub.read_epub.return_value = mock_book
+
+            result = extract_epub_metadata("test.epub")
+
+            assert result.cover_image == b'cover'
+            assert result.cover_mime_type == 'image/png'
+            mock_book.get_items.assert_called_once_with()
+            mock_book.get_items_of_type.assert_not_called()
+
     def test_no_cover_returns_none(self):
         """When no cover is found, cover fields should be None."""
         with patch("app.epub") as mock_epub:
@@ -2,12 +2,14 @@
 
 import pytest
 import sys
+import warnings
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import app
+from audiobook_backend import epub_parser
 from app import extract_epub_text, parse_epub
 
 
@@ -107,6 +109,83 @@ class TestExtractEpubText:
             _, text = result[0]
             assert "Real content" in text
 
+    def test_documents_without_body_text_skip_html_parse(self):
+        """Image-only documents should be skipped before building a soup."""
+        with patch("app.epub") as mock_epub:
+            mock_book = MagicMock()
+
+            mock_cover = MagicMock()
+            mock_cover.get_content.return_value = b"""
+            <html>
+                <head><title>Cover</title></head>
+                <body><div class="cover"><img src="cover.jpg" alt=""/></div></body>
+            </html>
+            """
+
+            mock_chapter = MagicMock()
+            mock_chapter.get_content.return_value = b"""
+            <html>
+                <body><p>Real content here.</p></body>
+            </html>
+            """
+
+            mock_book.get_items_of_type.return_value = [mock_cover, mock_chapter]
+            mock_epub.read_epub.return_value = mock_book
+
+            with patch(
+                "audiobook_backend.epub_parser.BeautifulSoup",
+                wraps=epub_parser.BeautifulSoup,
+            ) as soup_cls:
+                result = extract_epub_text("cover.epub")
+
+            assert [text for _, text in result] == ["Real content here."]
+            assert soup_cls.call_count == 1
+
+    def test_xhtml_documents_do_not_emit_parser_warnings(self):
+        """XHTML chapters should parse without bs4's XML-as-HTML warning."""
+        with patch("app.epub") as mock_epub:
+            mock_book = MagicMock()
+            mock_item = MagicMock()
+            mock_item.get_content.return_value = (
+                b'<?xml version="1.0" encoding="utf-8"?>\n'
+                b'<html xmlns="http://www.w3.org/1999/xhtml">'
+                b"<head><title>Chapter</title></head>"
+                b"<body><p>XHTML content.</p>" + b"<p>More text.</p>" * 40 + b"</body></html>"
+            )
+            mock_book.get_items_of_type.return_value = [mock_item]
+            mock_epub.read_epub.return_value = mock_book
+
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                result = extract_epub_text("xhtml.epub")
+
+            assert result[0][1].startswith("XHTML content.")
+            assert caught == []
+
+    @pytest.mark.parametrize(
+        ("body", "expected"),
+        [
+            (b"<p>One<hr/>Two</p>", "One Two"),
+            (b"<p>See <table><tr><td>cell</td></tr></table> done</p>", "See cell done"),
+            (b"<p>Outer <div>inner block</div> tail</p>", "Outer inner block tail"),
+            (b"<p>A <![CDATA[cdata text]]> B</p>", "A cdata text B"),
+        ],
+    )
+    def test_block_tags_inside_paragraph_keep_trailing_text(self, body, expected):
+        """Text after a block nested in <p> must not be dropped."""
+        with patch("app.epub") as mock_epub:
+            mock_book = MagicMock()
+            mock_item = MagicMock()
+            mock_item.get_content.return_value = (
+                b"<html><head><title>Chapter</title></head><body>" + body + b"</body></html>"
+            )
+            mock_book.get_items_of_type.return_value = [mock_item]
+            mock_epub.read_epub.return_value = mock_book
+
+            result = extract_epub_text("nested.epub")
+
+            assert result[0][1] == expected
+
     def test_html_tags_stripped(self):
         """HTML tags should be stripped from content."""
         with patch("app.epub") as mock_epub:
@@ -184,6 +263,74 @@ class TestExtractEpubText:
             assert "Head Title" not in text
             assert "Table of contents" not in text
 
+    def test_parse_epub_prunes_nested_non_content_nodes(self):
+        """Scripts, styles, nav, and toc/landmark-marked subtrees should be removed from body text."""
+        with patch("app.epub") as mock_epub:
+            mock_book = MagicMock()
+            chapter_item = MagicMock()
+            chapter_item.get_content.return_value = b"""
+            <html>
+                <body>
+                    <h1>Chapter Heading</h1>
+                    <section epub:type="toc"><p>Toc entry</p><div class="inner"><p>Deep toc</p></div></section>
+                    <div class="Landmarks"><p>Landmark entry</p></div>
+                    <div><script>hidden()</script><style>p { color: red; }</style><p>Kept text.</p></div>
+                    <nav><p>Nav entry</p></nav>
+                </body>
+            </html>
+            """
+            chapter_item.get_name.return_value = "chapter-1.xhtml"
+
+            mock_book.get_metadata.side_effect = lambda ns, key: {
+                ('DC', 'title'): [('Test Book', {})],
+                ('DC', 'creator'): [('Test Author', {})],
+                ('OPF', 'cover'): [],
+            }.get((ns, key), [])
+            mock_book.get_items.return_value = []
+            mock_book.get_items_of_type.side_effect = lambda item_type: {
+                app.ebooklib.ITEM_DOCUMENT: [chapter_item],
+                app.ebooklib.ITEM_COVER: [],
+                app.ebooklib.ITEM_IMAGE: [],
+            }.get(item_type, [])
+            mock_epub.read_epub.return_value = mock_book
+
+            result = extract_epub_text("test.epub")
+
+            assert result == [("Chapter Heading", "Chapter Heading\n\nKept text.")]
+
+    def test_parse_epub_skips_pruning_walk_for_clean_chapters(self):
+        """Chapters without script/style/nav or toc markers in the body should skip pruning."""
+        with patch("app.epub") as mock_epub, patch(
+            "audiobook_backend.epub_parser._prune_non_content_nodes"
+        ) as prune:
+            mock_book = MagicMock()
+            clean_item = MagicMock()
+            clean_item.get_content.return_value = (
+                b"<html><head><style>p {}</style></head><body><p>Clean.</p></body></html>"
+            )
+            clean_item.get_name.return_value = "chapter-1.xhtml"
+            nav_item = MagicMock()
+            nav_item.get_content.return_value = (
+                b"<html><body><nav>Menu</nav><p>Marked.</p></body></html>"
+            )
+            nav_item.get_name.return_value = "chapter-2.xhtml"
+
+            mock_book.get_metadata.side_effect = lambda ns, key: {
+                ('DC', 'title'): [('Test Book', {})],
+                ('DC', 'creator'): [('Test Author', {})],
+                ('OPF', 'cover'): [],
+            }.get((ns, key), [])
+            mock_book.get_items.return_value = []
+            mock_book.get_items_of_type.side_effect = lambda item_type: {
+                app.ebooklib.ITEM_DOCUMENT: [clean_item, nav_item],
+            }.get(item_type, [])
+            mock_epub.read_epub.return_value = mock_book
+
+            result = extract_epub_text("test.epub")
+
+            assert [text for _, text in result] == ["Clean.", "Marked."]
+            prune.assert_called_once()
+
     def test_parse_epub_reports_document_progress(self):
         """Shared parser should report document-level progress."""
         with patch("app.epub") as mock_epub:
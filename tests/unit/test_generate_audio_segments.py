@@ -10,7 +10,7 @@ import numpy as np
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backends import create_backend, TTSBackend
-from backends.kokoro_pytorch import KokoroPyTorchBackend
+from backends.kokoro_pytorch import KokoroPyTorchBackend, _TorchCaps, _torch_caps
 from backends.mock import MockTTSBackend
 
 
@@ -65,6 +65,83 @@ class TestTTSBackendGenerate:
             split_pattern=r"\n+",
         )
 
+    def test_pytorch_backend_computes_segments_in_inference_mode(self):
+        """Each pipeline step should run inside the backend's inference-mode context."""
+        backend = KokoroPyTorchBackend()
+        active = []
+
+        class FakeInferenceMode:
+            def __enter__(self):
+                active.append(True)
+
+            def __exit__(self, *exc_info):
+                active.pop()
+
+        def pipeline(*_args, **_kwargs):
+            for idx in range(2):
+                assert active == [True]
+                yield ("g", "p", np.full(3, idx, dtype=np.float32))
+
+        backend._pipeline = pipeline
+        backend._inference_mode = FakeInferenceMode
+
+        for _audio in backend.generate(text="Hi", voice="af_heart", speed=1.0):
+            assert active == []
+
+    def test_pytorch_backend_reuses_loaded_model_across_initialize(self, monkeypatch):
+        """Re-initializing on the same device should not reload model weights."""
+        from types import SimpleNamespace
+
+        model_class = MagicMock()
+        fake_kokoro = SimpleNamespace(KModel=model_class, KPipeline=MagicMock())
+        fake_torch = SimpleNamespace(
+            inference_mode=MagicMock(),
+            cuda=SimpleNamespace(is_available=MagicMock(return_value=False)),
+            backends=SimpleNamespace(),
+        )
+        monkeypatch.setitem(sys.modules, "kokoro", fake_kokoro)
+        monkeypatch.setitem(sys.modules, "torch", fake_torch)
+        KokoroPyTorchBackend.clear_model_cache()
+        _torch_caps.cache_clear()
+
+        try:
+            first = KokoroPyTorchBackend()
+            first.initialize(device="cpu")
+            first.cleanup()
+            second = KokoroPyTorchBackend()
+            second.initialize(device="cpu")
+        finally:
+            KokoroPyTorchBackend.clear_model_cache()
+            _torch_caps.cache_clear()
+
+        model_class.assert_called_once_with()
+        assert second._model is model_class.return_value.to.return_value.eval.return_value
+
+    def test_torch_capabilities_are_probed_once(self, monkeypatch):
+        """Accelerator detection should be cached instead of re-probing the driver."""
+        from types import SimpleNamespace
+
+        is_available = MagicMock(return_value=True)
+        fake_torch = SimpleNamespace(
+            cuda=SimpleNamespace(is_available=MagicMock(return_value=False)),
+            backends=SimpleNamespace(mps=SimpleNamespace(is_available=is_available)),
+            mps=SimpleNamespace(empty_cache=MagicMock()),
+        )
+        monkeypatch.setitem(sys.modules, "torch", fake_torch)
+        _torch_caps.cache_clear()
+
+        try:
+            caps = _torch_caps()
+            assert _torch_caps() is caps
+            backend = KokoroPyTorchBackend()
+            backend.release_device_cache()
+        finally:
+            _torch_caps.cache_clear()
+
+        assert caps == _TorchCaps(has_cuda=False, has_mps=True, has_mps_empty_cache=True)
+        is_available.assert_called_once_with()
+        fake_torch.mps.empty_cache.assert_called_once_with()
+
     def test_backend_not_initialized_raises_error(self):
         """Backend should raise error if generate called before initialize."""
         backend = KokoroPyTorchBackend()
@@ -199,3 +276,27 @@ class TestBackendFactory:
         backend = create_backend("mock")
         assert backend.name == "mock"
         assert isinstance(backend, MockTTSBackend)
+
+
+@pytest.mark.unit
+class TestMockBackend:
+    """Test cases for the deterministic mock backend."""
+
+    @pytest.mark.parametrize("segment", ["", "Hello world.", "Café — naïve 😀 text"])
+    def test_segment_seed_matches_position_weighted_ord_sum(self, segment):
+        """Vectorized seed should equal the reference per-character formula."""
+        from backends.mock import _segment_seed
+
+        expected = sum((idx + 1) * ord(ch) for idx, ch in enumerate(segment)) % 9973
+
+        assert _segment_seed(segment) == expected
+
+    def test_envelope_is_cached_and_read_only(self):
+        """Envelopes of equal length should be shared and guarded against mutation."""
+        from backends.mock import _envelope
+
+        envelope = _envelope(16)
+
+        assert _envelope(16) is envelope
+        assert not envelope.flags.writeable
+        np.testing.assert_array_equal(envelope, np.linspace(0.9, 0.5, 16, dtype=np.float32))
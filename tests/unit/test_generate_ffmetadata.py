@@ -1,5 +1,7 @@
 """Tests for the generate_ffmetadata function."""
 
+import os
+
 import pytest
 import sys
 from pathlib import Path
@@ -13,6 +15,7 @@ from app import (
     ChapterInfo,
     DEFAULT_SAMPLE_RATE,
 )
+from audiobook_backend.export import _write_ffmetadata_tempfile
 
 
 @pytest.mark.unit
@@ -44,6 +47,10 @@ class TestEscapeFfmetadata:
         result = _escape_ffmetadata("a=b;c#d\\e")
         assert result == "a\\=b\\;c\\#d\\\\e"
 
+    def test_escaped_backslash_is_not_escaped_again(self):
+        """Backslashes produced by escaping should not be escaped a second time."""
+        assert _escape_ffmetadata("\\=\n") == "\\\\\\=\\\n"
+
     def test_no_escape_needed(self):
         """Normal text should pass through unchanged."""
         assert _escape_ffmetadata("Hello World") == "Hello World"
@@ -168,3 +175,23 @@ class TestGenerateFfmetadata:
 
         # Should still produce output
         assert "[CHAPTER]" in result
+
+
+@pytest.mark.unit
+class TestWriteFfmetadataTempfile:
+    """Test cases for _write_ffmetadata_tempfile helper."""
+
+    def test_writes_utf8_metadata_file(self):
+        """Temp file should hold the UTF-8 encoded ffmetadata content."""
+        metadata = BookMetadata(title="Café Stories", author="Zoë")
+        chapters = [ChapterInfo(title="Über", start_sample=0, end_sample=24000)]
+
+        path = _write_ffmetadata_tempfile(metadata, chapters, 24000)
+        try:
+            assert path.endswith(".txt")
+            with open(path, "rb") as handle:
+                content = handle.read().decode("utf-8")
+        finally:
+            os.unlink(path)
+
+        assert content == generate_ffmetadata(metadata, chapters, 24000)
@@ -44,6 +44,7 @@ class TestParseArgs:
             assert args.checkpoint is False
             assert args.event_format == "text"
             assert args.log_file is None
+            assert args.async_events is False
 
     def test_custom_voice(self):
         """Should accept custom voice."""
@@ -1,11 +1,12 @@
 """Tests for backend resolution, event emission, and ffmpeg stream helpers."""
 
+import dataclasses
 import json
 import subprocess
 import sys
 from pathlib import Path
-from types import SimpleNamespace
-from unittest.mock import MagicMock
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, Mock
 
 import numpy as np
 import pytest
@@ -13,51 +14,97 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import app
+from audiobook_backend import events as app_events
 from backends.factory import get_available_backends
 from backends.kokoro_mlx import is_mlx_available
 
 
-def build_main_args(tmp_path: Path, **overrides) -> SimpleNamespace:
+_MAIN_ARG_DEFAULTS = MappingProxyType({
+    "backend": "mock",
+    "device": "auto",
+    "pipeline_mode": None,
+    "format": "mp3",
+    "chunk_chars": 120,
+    "checkpoint": False,
+    "resume": False,
+    "check_checkpoint": False,
+    "extract_metadata": False,
+    "inspect_job": False,
+    "event_format": "text",
+    "log_file": None,
+    "async_events": False,
+    "no_checkpoint": False,
+    "prefetch_chunks": 1,
+    "pcm_queue_size": 1,
+    "workers": 1,
+    "title": None,
+    "author": None,
+    "cover": None,
+    "voice": "af_heart",
+    "speed": 1.0,
+    "lang_code": "a",
+    "split_pattern": r"\n+",
+    "bitrate": "192k",
+    "normalize": False,
+    "no_rich": True,
+})
+
+
+def build_main_args(tmp_path: Path, write_input: bool = False, **overrides) -> SimpleNamespace:
+    # Every test patches the EPUB readers, so the input file is only created on request.
     input_path = tmp_path / "input.epub"
-    input_path.write_bytes(b"dummy-epub")
+    if write_input:
+        input_path.write_bytes(b"dummy-epub")
 
-    values = {
+    return SimpleNamespace(**{
+        **_MAIN_ARG_DEFAULTS,
         "input": str(input_path),
         "output": str(tmp_path / "output.mp3"),
-        "backend": "mock",
-        "device": "auto",
-        "pipeline_mode": None,
-        "format": "mp3",
-        "chunk_chars": 120,
-        "checkpoint": False,
-        "resume": False,
-        "check_checkpoint": False,
-        "extract_metadata": False,
-        "inspect_job": False,
-        "event_format": "text",
-        "log_file": None,
-        "no_checkpoint": False,
-        "prefetch_chunks": 1,
-        "pcm_queue_size": 1,
-        "workers": 1,
-        "title": None,
-        "author": None,
-        "cover": None,
-        "voice": "af_heart",
-        "speed": 1.0,
-        "lang_code": "a",
-        "split_pattern": r"\n+",
-        "bitrate": "192k",
-        "normalize": False,
-        "no_rich": True,
+        **overrides,
+    })
+
+
+STUB_PCM = np.array([0.25, -0.25], dtype=np.float32)
+STUB_PCM.flags.writeable = False
+
+
+def build_mock_backend(**overrides) -> SimpleNamespace:
+    values = {
+        "name": "mock",
+        "sample_rate": 24000,
+        "initialize": MagicMock(),
+        "generate": MagicMock(return_value=[STUB_PCM]),
+        "cleanup": MagicMock(),
     }
     values.update(overrides)
     return SimpleNamespace(**values)
 
 
+def split_into_single_chunk(chapters, chunk_chars):
+    return [app.TextChunk("Chapter 1", "Hello world")], [(0, "Chapter 1")]
+
+
+def patch_main_entry(monkeypatch, args: SimpleNamespace, events: MagicMock, **app_attrs) -> None:
+    """Point app.main() at ``args`` and ``events`` and patch the given app attributes."""
+    monkeypatch.setattr(app.sys, "version_info", (3, 12, 0))
+    monkeypatch.setattr(app, "parse_args", lambda: args)
+    monkeypatch.setattr(app, "EventEmitter", lambda **kwargs: events)
+    for name, value in app_attrs.items():
+        monkeypatch.setattr(app, name, value)
+
+
+@pytest.fixture(scope="module")
+def hello_world_epub() -> app.ParsedEpub:
+    """One-chapter book shared by the main() tests; main() never mutates it."""
+    return app.ParsedEpub(
+        metadata=app.BookMetadata(title="Title", author="Author"),
+        chapters=[("Chapter 1", "Hello world")],
+    )
+
+
 class FakeProc:
     def __init__(self):
-        self.stdin = MagicMock()
+        self.stdin = Mock(spec=["write", "close"])
         self.returncode = None
         self.wait = MagicMock(side_effect=self._wait)
         self.kill = MagicMock(side_effect=self._kill)
@@ -73,31 +120,30 @@ class FakeProc:
         self.returncode = -9
 
 
-@pytest.mark.unit
-class TestPipelineModeAndBackendResolution:
-    def setup_method(self):
-        app._AUTO_BACKEND_CACHE = None
+def build_finished_export_proc(returncode: int, stderr: bytes = b"") -> SimpleNamespace:
+    return SimpleNamespace(
+        stdin=Mock(spec=["write", "close"]),
+        stderr=SimpleNamespace(read=Mock(return_value=stderr)),
+        wait=Mock(return_value=returncode),
+    )
 
-    def teardown_method(self):
-        app._AUTO_BACKEND_CACHE = None
 
-    def test_default_pipeline_mode_uses_sequential_on_apple_silicon_mp3_without_checkpoint(
-        self, monkeypatch
-    ):
-        monkeypatch.setattr(app.sys, "platform", "darwin")
-        monkeypatch.setattr(app.platform, "machine", lambda: "arm64")
-
-        assert app.default_pipeline_mode("mp3", use_checkpoint=False) == "sequential"
+@pytest.mark.unit
+class TestPipelineModeAndBackendResolution:
+    @pytest.fixture(autouse=True)
+    def reset_auto_backend_cache(self, monkeypatch):
+        monkeypatch.setattr(app, "_AUTO_BACKEND_CACHE", None)
 
     @pytest.mark.parametrize(
         "output_format,use_checkpoint,platform_name,machine,expected",
         [
+            ("mp3", False, "darwin", "arm64", "sequential"),
             ("m4b", False, "darwin", "arm64", "sequential"),
             ("mp3", True, "darwin", "arm64", "sequential"),
             ("mp3", False, "linux", "x86_64", "sequential"),
         ],
     )
-    def test_default_pipeline_mode_sequential_other_cases(
+    def test_default_pipeline_mode_is_sequential(
         self,
         monkeypatch,
         output_format,
@@ -114,10 +160,44 @@ class TestPipelineModeAndBackendResolution:
     def test_resolve_backend_returns_explicit_backend_without_auto_detection(self):
         assert app.resolve_backend("mock") == "mock"
 
+    def test_resolve_backend_auto_probes_mlx_in_process(self, monkeypatch):
+        monkeypatch.setattr(app.sys, "platform", "darwin")
+        monkeypatch.setattr(app.platform, "machine", lambda: "arm64")
+        monkeypatch.setattr(app, "is_low_memory_apple_host", lambda: False)
+        monkeypatch.delenv("AUDIOBOOK_SAFE_MLX_PROBE", raising=False)
+        monkeypatch.setattr(app.importlib.util, "find_spec", lambda name: object())
+        mx = MagicMock()
+        import_module = MagicMock(return_value=mx)
+        monkeypatch.setattr(app.importlib, "import_module", import_module)
+        run_mock = MagicMock()
+        monkeypatch.setattr(app.subprocess, "run", run_mock)
+
+        assert app.resolve_backend("auto") == "mlx"
+        assert app.resolve_backend("auto") == "mlx"
+
+        import_module.assert_called_once_with("mlx.core")
+        mx.array.assert_called_once_with([1.0])
+        run_mock.assert_not_called()
+
+    def test_resolve_backend_auto_falls_back_when_in_process_probe_fails(self, monkeypatch):
+        monkeypatch.setattr(app.sys, "platform", "darwin")
+        monkeypatch.setattr(app.platform, "machine", lambda: "arm64")
+        monkeypatch.setattr(app, "is_low_memory_apple_host", lambda: False)
+        monkeypatch.delenv("AUDIOBOOK_SAFE_MLX_PROBE", raising=False)
+        monkeypatch.setattr(app.importlib.util, "find_spec", lambda name: object())
+        monkeypatch.setattr(
+            app.importlib,
+            "import_module",
+            MagicMock(side_effect=RuntimeError("no Metal device")),
+        )
+
+        assert app.resolve_backend("auto") == "pytorch"
+
     def test_resolve_backend_auto_uses_mlx_when_probe_succeeds(self, monkeypatch):
         monkeypatch.setattr(app.sys, "platform", "darwin")
         monkeypatch.setattr(app.platform, "machine", lambda: "arm64")
         monkeypatch.setattr(app, "is_low_memory_apple_host", lambda: False)
+        monkeypatch.setenv("AUDIOBOOK_SAFE_MLX_PROBE", "1")
         monkeypatch.setattr(app.importlib.util, "find_spec", lambda name: object())
         probe = MagicMock(returncode=0)
         run_mock = MagicMock(return_value=probe)
@@ -145,6 +225,7 @@ class TestPipelineModeAndBackendResolution:
         monkeypatch.setattr(app.sys, "platform", "darwin")
         monkeypatch.setattr(app.platform, "machine", lambda: "arm64")
         monkeypatch.setattr(app, "is_low_memory_apple_host", lambda: False)
+        monkeypatch.setenv("AUDIOBOOK_SAFE_MLX_PROBE", "1")
         monkeypatch.setattr(app.importlib.util, "find_spec", lambda name: object())
 
         def raise_timeout(*args, **kwargs):
@@ -163,6 +244,19 @@ class TestPipelineModeAndBackendResolution:
         assert app.resolve_backend("auto") == "pytorch"
         find_spec.assert_not_called()
 
+    def test_macos_memory_probe_runs_sysctl_once(self, monkeypatch):
+        monkeypatch.setattr(app.sys, "platform", "darwin")
+        run_mock = MagicMock(return_value=SimpleNamespace(returncode=0, stdout="8589934592\n"))
+        monkeypatch.setattr(app.subprocess, "run", run_mock)
+        app._get_macos_total_memory_bytes.cache_clear()
+        try:
+            assert app._get_macos_total_memory_bytes() == 8 * 1024**3
+            assert app._get_macos_total_memory_bytes() == 8 * 1024**3
+        finally:
+            app._get_macos_total_memory_bytes.cache_clear()
+
+        run_mock.assert_called_once()
+
     def test_resolve_device_defaults_to_cpu_on_low_memory_apple(self, monkeypatch, tmp_path):
         monkeypatch.setattr(app, "is_low_memory_apple_host", lambda: True)
         args = build_main_args(tmp_path, backend="pytorch", device="auto")
@@ -198,17 +292,56 @@ class TestEventEmitter:
         emitter.close()
 
         captured = capsys.readouterr()
-        assert "PHASE:PARSING" in captured.out
-        assert "PARSE_PROGRESS:1/3:1" in captured.out
-        assert "PROGRESS:2/5 chunks" in captured.out
-        assert "CHECKPOINT:FOUND:5:2" in captured.out
-        assert "DONE" in captured.out
-        assert "WARN: careful" in captured.err
-        assert "boom" in captured.err
+        assert captured.out.splitlines() == [
+            "PHASE:PARSING",
+            "PARSE_PROGRESS:1/3:1",
+            "PROGRESS:2/5 chunks",
+            "CHECKPOINT:FOUND:5:2",
+            "DONE",
+        ]
+        assert captured.err.splitlines() == ["WARN: careful", "boom"]
+
+        log_lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert log_lines[0] == "PHASE:PARSING"
+        assert log_lines[-1] == "DONE"
+
+    def test_log_file_is_flushed_on_milestone_events(self, capsys, tmp_path):
+        log_path = tmp_path / "events.log"
+        emitter = app.EventEmitter(event_format="text", job_id="job-1", log_file=str(log_path))
+
+        emitter.emit("progress", current_chunk=1, total_chunks=5)
+        assert "PROGRESS:1/5 chunks" in capsys.readouterr().out
+        assert log_path.read_text(encoding="utf-8") == ""
 
-        log_text = log_path.read_text(encoding="utf-8")
-        assert "PHASE:PARSING" in log_text
-        assert "DONE" in log_text
+        emitter.emit("checkpoint", code="SAVED", detail=1)
+        assert log_path.read_text(encoding="utf-8").splitlines() == [
+            "PROGRESS:1/5 chunks",
+            "CHECKPOINT:SAVED:1",
+        ]
+
+        emitter.emit("progress", current_chunk=2, total_chunks=5)
+        emitter.close()
+        assert log_path.read_text(encoding="utf-8").splitlines()[-1] == "PROGRESS:2/5 chunks"
+
+    def test_log_file_is_flushed_after_interval_between_milestones(self, monkeypatch, capsys, tmp_path):
+        clock = [100.0]
+        monkeypatch.setattr(app_events.time, "monotonic", lambda: clock[0])
+        log_path = tmp_path / "events.log"
+        emitter = app.EventEmitter(event_format="text", job_id="job-1", log_file=str(log_path))
+
+        emitter.emit("progress", current_chunk=1, total_chunks=5)
+        assert log_path.read_text(encoding="utf-8") == ""
+
+        clock[0] += app_events.LOG_FLUSH_INTERVAL_SECONDS
+        emitter.emit("timing", chunk_idx=1, chunk_timing_ms=250)
+        assert log_path.read_text(encoding="utf-8").splitlines() == [
+            "PROGRESS:1/5 chunks",
+            "TIMING:1:250",
+        ]
+
+        emitter.emit("progress", current_chunk=2, total_chunks=5)
+        assert log_path.read_text(encoding="utf-8").splitlines()[-1] == "TIMING:1:250"
+        emitter.close()
 
     def test_json_event_emitter_emits_structured_payload(self, monkeypatch, capsys):
         monkeypatch.setattr(app.time, "time", lambda: 1700000000.123)
@@ -218,18 +351,94 @@ class TestEventEmitter:
         emitter.info("hello")
 
         captured = capsys.readouterr()
-        lines = [line for line in captured.out.splitlines() if line.strip()]
-        progress = json.loads(lines[0])
-        info = json.loads(lines[1])
-
-        assert progress["type"] == "progress"
-        assert progress["job_id"] == "job-42"
-        assert progress["current_chunk"] == 4
-        assert progress["total_chunks"] == 10
-        assert progress["ts_ms"] == 1700000000123
-        assert info["type"] == "log"
-        assert info["level"] == "info"
-        assert info["message"] == "hello"
+        assert [json.loads(line) for line in captured.out.splitlines()] == [
+            {
+                "type": "progress",
+                "ts_ms": 1700000000123,
+                "job_id": "job-42",
+                "current_chunk": 4,
+                "total_chunks": 10,
+            },
+            {
+                "type": "log",
+                "ts_ms": 1700000000123,
+                "job_id": "job-42",
+                "level": "info",
+                "message": "hello",
+            },
+        ]
+
+    def test_json_event_envelope_matches_full_dict_encoding(self, monkeypatch, capsys):
+        monkeypatch.setattr(app.time, "time", lambda: 1700000000.5)
+        emitter = app.EventEmitter(event_format="json", job_id='job "quoted"')
+
+        emitter.emit("done")
+        emitter.emit("timing", chunk_idx=3, chunk_timing_ms=120)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == [
+            json.dumps(
+                {"type": "done", "ts_ms": 1700000000500, "job_id": 'job "quoted"'},
+                ensure_ascii=False,
+            ),
+            json.dumps(
+                {
+                    "type": "timing",
+                    "ts_ms": 1700000000500,
+                    "job_id": 'job "quoted"',
+                    "chunk_idx": 3,
+                    "chunk_timing_ms": 120,
+                },
+                ensure_ascii=False,
+            ),
+        ]
+
+    def test_async_event_emitter_flushes_stdout_and_log_on_close(self, capsys, tmp_path):
+        log_path = tmp_path / "events.log"
+        emitter = app.EventEmitter(
+            event_format="text",
+            job_id="job-7",
+            log_file=str(log_path),
+            async_events=True,
+        )
+
+        for chunk in range(1, 51):
+            emitter.emit("progress", current_chunk=chunk, total_chunks=50)
+        emitter.warn("careful")
+        emitter.close()
+
+        captured = capsys.readouterr()
+        out_lines = captured.out.splitlines()
+        assert out_lines[0] == "PROGRESS:1/50 chunks"
+        assert out_lines[-1] == "PROGRESS:50/50 chunks"
+        assert len(out_lines) == 50
+        assert "WARN: careful" in captured.err
+
+        log_lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert log_lines[-2:] == ["PROGRESS:50/50 chunks", "WARN: careful"]
+
+    def test_buffered_event_sink_preserves_order_across_buffer_swaps(self, capsys):
+        import sys as _sys
+
+        sink = app_events.BufferedEventSink(_sys.stdout, capacity=16)
+        lines = [f"line-{idx}\n".encode("utf-8") for idx in range(100)]
+        for line in lines:
+            sink.write(line)
+        sink.write(b"x" * 64 + b"\n")
+        sink.close()
+
+        captured = capsys.readouterr()
+        assert captured.out == b"".join(lines).decode("utf-8") + "x" * 64 + "\n"
+
+    def test_buffered_event_sink_flushes_stream_buffer_before_raw_writes(self, tmp_path):
+        out_path = tmp_path / "stdout.txt"
+        with open(out_path, "w", encoding="utf-8") as stream:
+            sink = app_events.BufferedEventSink(stream)
+            stream.write("printed before event\n")
+            sink.write(b"EVENT\n")
+            sink.close()
+
+        assert out_path.read_text(encoding="utf-8") == "printed before event\nEVENT\n"
 
     def test_text_event_emitter_emits_inspection_payload(self, capsys):
         emitter = app.EventEmitter(event_format="text", job_id="job-99")
@@ -240,6 +449,34 @@ class TestEventEmitter:
         assert 'INSPECTION:{"output_path": "book.mp3", "total_chunks": 4}' in captured.out
 
 
+@pytest.mark.unit
+class TestHeartbeatEmitter:
+    def test_heartbeat_skipped_while_progress_is_flowing(self, capsys):
+        events = app.EventEmitter(event_format="text", job_id="job-1")
+        stop_event, thread = app.start_heartbeat_emitter(events, interval_seconds=0.05)
+        deadline = app_events.time.monotonic() + 0.2
+        while app_events.time.monotonic() < deadline:
+            events.emit("parse_progress", current_item=1, total_items=2, current_chapter_count=0)
+            app_events.time.sleep(0.005)
+        stop_event.set()
+        thread.join(timeout=1)
+
+        assert not any(line.startswith("HEARTBEAT:") for line in capsys.readouterr().out.splitlines())
+
+    def test_heartbeat_emitted_when_only_log_lines_are_written(self, capsys):
+        events = app.EventEmitter(event_format="text", job_id="job-1")
+        stop_event, thread = app.start_heartbeat_emitter(events, interval_seconds=0.02)
+        deadline = app_events.time.monotonic() + 0.15
+        while app_events.time.monotonic() < deadline:
+            events.info("still parsing")
+            events.emit("metadata", key="title", value="Book")
+            app_events.time.sleep(0.005)
+        stop_event.set()
+        thread.join(timeout=1)
+
+        assert any(line.startswith("HEARTBEAT:") for line in capsys.readouterr().out.splitlines())
+
+
 @pytest.mark.unit
 class TestInspectionMode:
     def test_inspect_job_reports_metadata_and_checkpoint_compatibility(self, monkeypatch, tmp_path):
@@ -262,11 +499,7 @@ class TestInspectionMode:
         )
 
         monkeypatch.setattr(app, "parse_epub", lambda *_args, **_kwargs: parsed_epub)
-        monkeypatch.setattr(
-            app,
-            "split_text_to_chunks",
-            lambda chapters, chunk_chars: ([app.TextChunk("Chapter 1", "Hello world")], [(0, "Chapter 1")]),
-        )
+        monkeypatch.setattr(app, "split_text_to_chunks", split_into_single_chunk)
         monkeypatch.setattr(
             app,
             "inspect_checkpoint",
@@ -294,6 +527,9 @@ class TestInspectionMode:
         }
         assert inspection.checkpoint["resume_compatible"] is True
         assert inspection.checkpoint["completed_chunks"] == 1
+        assert list(inspection.to_dict()) == [
+            field.name for field in dataclasses.fields(app.JobInspectionResult)
+        ]
         assert inspection.resolved_pipeline_mode == "sequential"
         assert inspection.warnings == [
             "--pipeline_mode=overlap3 is currently supported only for MP3 without checkpointing; falling back to sequential."
@@ -313,11 +549,7 @@ class TestInspectionMode:
         )
 
         monkeypatch.setattr(app, "parse_epub", lambda *_args, **_kwargs: parsed_epub)
-        monkeypatch.setattr(
-            app,
-            "split_text_to_chunks",
-            lambda chapters, chunk_chars: ([app.TextChunk("Chapter 1", "Hello world")], [(0, "Chapter 1")]),
-        )
+        monkeypatch.setattr(app, "split_text_to_chunks", split_into_single_chunk)
         monkeypatch.setattr(
             app,
             "inspect_checkpoint",
@@ -366,63 +598,168 @@ class TestMp3StreamHelpers:
         assert "-ar" in cmd and "44100" in cmd
         assert "-af" in cmd
         assert "loudnorm=I=-14:TP=-1:LRA=11" in cmd
+        assert "-nostats" in cmd
+        assert popen_mock.call_args.kwargs["stdout"] == subprocess.DEVNULL
+        assert popen_mock.call_args.kwargs["bufsize"] == app.PCM_PIPE_BUFFER_BYTES
         assert cmd[-1] == "out.mp3"
 
-    def test_close_mp3_export_stream_closes_stdin_and_waits(self):
-        proc = SimpleNamespace(
-            stdin=MagicMock(),
-            stderr=SimpleNamespace(read=MagicMock(return_value=b"")),
-            wait=MagicMock(return_value=0),
-        )
+    def test_ffmpeg_lookup_is_cached_across_export_calls(self, monkeypatch):
+        which = MagicMock(return_value="/usr/bin/ffmpeg")
+        monkeypatch.setattr(app.shutil, "which", which)
+        monkeypatch.setattr(app.subprocess, "Popen", MagicMock())
 
-        app.close_mp3_export_stream(proc)  # type: ignore[arg-type]
+        app.open_mp3_export_stream("one.mp3")
+        app.open_m4b_export_stream("two.m4a")
+
+        which.assert_called_once_with("ffmpeg")
+
+    def test_write_pcm_chunk_writes_int16_samples_without_bytes_copy(self):
+        stream = MagicMock()
+
+        app.write_pcm_chunk(stream, np.array([0.5, -0.5], dtype=np.float32))
+        app.write_pcm_chunk(stream, np.array([7, -7], dtype=np.int16))
+
+        written = [call.args[0] for call in stream.write.call_args_list]
+        assert all(isinstance(chunk, memoryview) for chunk in written)
+        assert b"".join(written) == np.array([16383, -16383, 7, -7], dtype=np.int16).tobytes()
+
+    def test_close_export_stream_closes_stdin_and_waits(self):
+        proc = build_finished_export_proc(0)
+
+        app.close_export_stream(proc)  # type: ignore[arg-type]
 
         proc.stdin.close.assert_called_once()
         proc.stderr.read.assert_called_once()
         proc.wait.assert_called_once()
 
-    def test_close_mp3_export_stream_raises_on_ffmpeg_failure(self):
-        proc = SimpleNamespace(
-            stdin=MagicMock(),
-            stderr=SimpleNamespace(read=MagicMock(return_value=b"bad audio")),
-            wait=MagicMock(return_value=1),
-        )
+    def test_close_export_stream_raises_on_ffmpeg_failure(self):
+        proc = build_finished_export_proc(1, b"bad audio")
 
         with pytest.raises(RuntimeError, match="ffmpeg failed: bad audio"):
-            app.close_mp3_export_stream(proc)  # type: ignore[arg-type]
+            app.close_export_stream(proc)  # type: ignore[arg-type]
 
+    def test_close_export_stream_reports_only_stderr_tail(self):
+        stderr = "\n".join(f"line {index}" for index in range(200)).encode()
+        proc = build_finished_export_proc(1, stderr)
 
-@pytest.mark.unit
-class TestMainCleanupBehavior:
-    def test_main_cleans_backend_ffmpeg_and_gc_on_failure(self, monkeypatch, tmp_path):
-        args = build_main_args(tmp_path)
-        events = MagicMock()
-        parsed_epub = app.ParsedEpub(
+        with pytest.raises(RuntimeError) as excinfo:
+            app.close_export_stream(proc)  # type: ignore[arg-type]
+
+        message = str(excinfo.value)
+        assert message.startswith("ffmpeg failed: line 136\n")
+        assert message.endswith("line 199")
+
+    def test_open_m4b_export_stream_encodes_aac_from_stdin(self, monkeypatch):
+        popen_mock = MagicMock(return_value=MagicMock())
+        monkeypatch.setattr(app.shutil, "which", lambda _: "/usr/bin/ffmpeg")
+        monkeypatch.setattr(app.subprocess, "Popen", popen_mock)
+
+        app.open_m4b_export_stream(
+            "track.m4a",
+            sample_rate=24000,
+            bitrate="64k",
+            normalize=False,
+        )
+
+        cmd = popen_mock.call_args.args[0]
+        assert cmd[cmd.index("-i") + 1] == "pipe:0"
+        assert cmd[cmd.index("-c:a") + 1] == "aac"
+        assert cmd[cmd.index("-b:a") + 1] == "64k"
+        assert "-af" not in cmd
+        assert popen_mock.call_args.kwargs["bufsize"] == app.PCM_PIPE_BUFFER_BYTES
+        assert cmd[-1] == "track.m4a"
+
+    def test_finalize_m4b_export_stream_remuxes_without_reencoding(self, monkeypatch):
+        proc = build_finished_export_proc(0)
+        run_mock = MagicMock(return_value=SimpleNamespace(returncode=0, stderr=b""))
+        monkeypatch.setattr(app.shutil, "which", lambda _: "/usr/bin/ffmpeg")
+        monkeypatch.setattr(app.subprocess, "run", run_mock)
+
+        app.finalize_m4b_export_stream(
+            proc,  # type: ignore[arg-type]
+            "track.m4a",
+            "out.m4b",
             metadata=app.BookMetadata(title="Title", author="Author"),
-            chapters=[("Chapter 1", "Hello world")],
+            chapters=[app.ChapterInfo(title="One", start_sample=0, end_sample=24000)],
+            sample_rate=24000,
         )
-        backend = SimpleNamespace(
-            name="mock",
+
+        proc.stdin.close.assert_called_once()
+        cmd = run_mock.call_args.args[0]
+        assert cmd[cmd.index("-i") + 1] == "track.m4a"
+        assert cmd[cmd.index("-c:a") + 1] == "copy"
+        assert "loudnorm=I=-14:TP=-1:LRA=11" not in cmd
+        assert cmd[-1] == "out.m4b"
+
+    def test_finalize_m4b_export_stream_encodes_silence_at_requested_bitrate(
+        self, monkeypatch
+    ):
+        proc = build_finished_export_proc(0)
+        run_mock = MagicMock(return_value=SimpleNamespace(returncode=0, stderr=b""))
+        monkeypatch.setattr(app.shutil, "which", lambda _: "/usr/bin/ffmpeg")
+        monkeypatch.setattr(app.subprocess, "run", run_mock)
+
+        app.finalize_m4b_export_stream(
+            proc,  # type: ignore[arg-type]
+            "track.m4a",
+            "out.m4b",
+            metadata=app.BookMetadata(title="Title", author="Author"),
+            chapters=[],
             sample_rate=24000,
-            initialize=MagicMock(),
+            bitrate="128k",
+            has_audio=False,
+        )
+
+        cmd = run_mock.call_args.args[0]
+        assert "track.m4a" not in cmd
+        assert cmd[cmd.index("-b:a") + 1] == "128k"
+
+
+@pytest.mark.unit
+class TestOverlap3Queue:
+    def test_bounded_queue_applies_backpressure(self):
+        import queue
+        import threading
+
+        from audiobook_backend.pipeline import _BoundedQueue
+
+        pcm_queue = _BoundedQueue(1)
+        pcm_queue.put("first")
+        producer = threading.Thread(target=pcm_queue.put, args=("second",), daemon=True)
+        producer.start()
+        producer.join(timeout=0.05)
+
+        assert producer.is_alive()
+        assert pcm_queue.get() == "first"
+        producer.join(timeout=1)
+        assert not producer.is_alive()
+        assert pcm_queue.get(timeout=0.1) == "second"
+        with pytest.raises(queue.Empty):
+            pcm_queue.get(timeout=0.01)
+
+
+@pytest.mark.unit
+class TestMainCleanupBehavior:
+    def test_main_cleans_backend_ffmpeg_and_gc_on_failure(self, monkeypatch, tmp_path, hello_world_epub):
+        args = build_main_args(tmp_path)
+        events = Mock(spec=app.EventEmitter)
+        backend = build_mock_backend(
             generate=MagicMock(side_effect=RuntimeError("inference failed")),
             cleanup=MagicMock(side_effect=RuntimeError("backend cleanup failed")),
         )
         proc = FakeProc()
         gc_collect = MagicMock()
 
-        monkeypatch.setattr(app.sys, "version_info", (3, 12, 0))
-        monkeypatch.setattr(app, "parse_args", lambda: args)
-        monkeypatch.setattr(app, "EventEmitter", lambda **kwargs: events)
-        monkeypatch.setattr(app, "resolve_backend", lambda _: "mock")
-        monkeypatch.setattr(app, "parse_epub", lambda *args, **kwargs: parsed_epub)
-        monkeypatch.setattr(
-            app,
-            "split_text_to_chunks",
-            lambda chapters, chunk_chars: ([app.TextChunk("Chapter 1", "Hello world")], [(0, "Chapter 1")]),
+        patch_main_entry(
+            monkeypatch,
+            args,
+            events,
+            resolve_backend=lambda _: "mock",
+            parse_epub=lambda *args, **kwargs: hello_world_epub,
+            split_text_to_chunks=split_into_single_chunk,
+            create_backend=lambda _: backend,
+            open_mp3_export_stream=lambda *args, **kwargs: proc,
         )
-        monkeypatch.setattr(app, "create_backend", lambda _: backend)
-        monkeypatch.setattr(app, "open_mp3_export_stream", lambda *args, **kwargs: proc)
         monkeypatch.setattr(app.gc, "collect", gc_collect)
 
         with pytest.raises(RuntimeError, match="inference failed"):
@@ -435,18 +772,10 @@ class TestMainCleanupBehavior:
         events.error.assert_called_once_with("inference failed")
         events.close.assert_called_once()
 
-    def test_main_cleans_spool_file_and_gc_on_export_failure(self, monkeypatch, tmp_path):
+    def test_main_cleans_spool_file_and_gc_on_export_failure(self, monkeypatch, tmp_path, hello_world_epub):
         args = build_main_args(tmp_path, checkpoint=True)
-        events = MagicMock()
-        parsed_epub = app.ParsedEpub(
-            metadata=app.BookMetadata(title="Title", author="Author"),
-            chapters=[("Chapter 1", "Hello world")],
-        )
-        backend = SimpleNamespace(
-            name="mock",
-            sample_rate=24000,
-            initialize=MagicMock(),
-            generate=MagicMock(return_value=[np.array([0.25, -0.25], dtype=np.float32)]),
+        events = Mock(spec=app.EventEmitter)
+        backend = build_mock_backend(
             cleanup=MagicMock(side_effect=RuntimeError("backend cleanup failed")),
         )
         spool_path = tmp_path / "spool-file.pcm"
@@ -460,26 +789,20 @@ class TestMainCleanupBehavior:
             def close(self):
                 return None
 
-        monkeypatch.setattr(app.sys, "version_info", (3, 12, 0))
-        monkeypatch.setattr(app, "parse_args", lambda: args)
-        monkeypatch.setattr(app, "EventEmitter", lambda **kwargs: events)
-        monkeypatch.setattr(app, "resolve_backend", lambda _: "mock")
-        monkeypatch.setattr(app, "parse_epub", lambda *args, **kwargs: parsed_epub)
-        monkeypatch.setattr(
-            app,
-            "split_text_to_chunks",
-            lambda chapters, chunk_chars: ([app.TextChunk("Chapter 1", "Hello world")], [(0, "Chapter 1")]),
+        patch_main_entry(
+            monkeypatch,
+            args,
+            events,
+            resolve_backend=lambda _: "mock",
+            parse_epub=lambda *args, **kwargs: hello_world_epub,
+            split_text_to_chunks=split_into_single_chunk,
+            create_backend=lambda _: backend,
+            compute_epub_hash=lambda _: "hash",
+            save_checkpoint=lambda *args, **kwargs: None,
+            save_chunk_audio=lambda *args, **kwargs: None,
+            export_pcm_file_to_mp3=MagicMock(side_effect=RuntimeError("export failed")),
         )
-        monkeypatch.setattr(app, "create_backend", lambda _: backend)
-        monkeypatch.setattr(app, "compute_epub_hash", lambda _: "hash")
-        monkeypatch.setattr(app, "save_checkpoint", lambda *args, **kwargs: None)
-        monkeypatch.setattr(app, "save_chunk_audio", lambda *args, **kwargs: None)
         monkeypatch.setattr(app.tempfile, "NamedTemporaryFile", lambda **kwargs: FakeTempFile(spool_path))
-        monkeypatch.setattr(
-            app,
-            "export_pcm_file_to_mp3",
-            MagicMock(side_effect=RuntimeError("export failed")),
-        )
         monkeypatch.setattr(app.gc, "collect", gc_collect)
 
         with pytest.raises(RuntimeError, match="export failed"):
@@ -491,46 +814,53 @@ class TestMainCleanupBehavior:
         events.error.assert_called_once_with("export failed")
         events.close.assert_called_once()
 
+    def test_main_reports_missing_input_from_reader_error(self, monkeypatch, tmp_path):
+        missing = tmp_path / "missing.epub"
+        args = build_main_args(tmp_path, input=str(missing), extract_metadata=True)
+        events = Mock(spec=app.EventEmitter)
+
+        patch_main_entry(monkeypatch, args, events)
+
+        with pytest.raises(FileNotFoundError, match="Input EPUB not found"):
+            app.main()
+
+        events.error.assert_called_once_with(f"Input EPUB not found: {missing}")
+        events.close.assert_called_once()
+
     def test_main_reads_epub_once_for_m4b(self, monkeypatch, tmp_path):
         args = build_main_args(
             tmp_path,
             output=str(tmp_path / "output.m4b"),
             format="m4b",
         )
-        events = MagicMock()
-        backend = SimpleNamespace(
-            name="mock",
-            sample_rate=24000,
-            initialize=MagicMock(),
-            generate=MagicMock(return_value=[np.array([0.25, -0.25], dtype=np.float32)]),
-            cleanup=MagicMock(),
-        )
+        events = Mock(spec=app.EventEmitter)
+        backend = build_mock_backend()
         mock_book = MagicMock()
         mock_doc = MagicMock()
         mock_doc.get_content.return_value = (
             b"<html><head><title>Chapter 1</title></head><body><p>Hello world.</p></body></html>"
         )
-        mock_book.get_metadata.side_effect = lambda ns, key: {
+        book_metadata = {
             ("DC", "title"): [("Test Book", {})],
             ("DC", "creator"): [("Test Author", {})],
-            ("OPF", "cover"): [],
-        }.get((ns, key), [])
+        }
+        items_by_type = {app.ebooklib.ITEM_DOCUMENT: [mock_doc]}
+        mock_book.get_metadata.side_effect = lambda ns, key: book_metadata.get((ns, key), ())
         mock_book.get_items.return_value = []
-        mock_book.get_items_of_type.side_effect = lambda item_type: {
-            app.ebooklib.ITEM_DOCUMENT: [mock_doc],
-            app.ebooklib.ITEM_COVER: [],
-            app.ebooklib.ITEM_IMAGE: [],
-        }.get(item_type, [])
+        mock_book.get_items_of_type.side_effect = lambda item_type: items_by_type.get(item_type, ())
         mock_epub = MagicMock()
         mock_epub.read_epub.return_value = mock_book
 
-        monkeypatch.setattr(app.sys, "version_info", (3, 12, 0))
-        monkeypatch.setattr(app, "parse_args", lambda: args)
-        monkeypatch.setattr(app, "EventEmitter", lambda **kwargs: events)
-        monkeypatch.setattr(app, "resolve_backend", lambda _: "mock")
-        monkeypatch.setattr(app, "create_backend", lambda _: backend)
-        monkeypatch.setattr(app, "export_pcm_file_to_m4b", MagicMock())
-        monkeypatch.setattr(app, "epub", mock_epub)
+        patch_main_entry(
+            monkeypatch,
+            args,
+            events,
+            resolve_backend=lambda _: "mock",
+            create_backend=lambda _: backend,
+            open_m4b_export_stream=lambda *args, **kwargs: FakeProc(),
+            finalize_m4b_export_stream=MagicMock(),
+            epub=mock_epub,
+        )
 
         app.main()
 
@@ -541,34 +871,30 @@ class TestMainCleanupBehavior:
             tmp_path,
             output=str(tmp_path / "output.m4b"),
             format="m4b",
+            bitrate="128k",
         )
-        events = MagicMock()
+        events = Mock(spec=app.EventEmitter)
         parsed_epub = app.ParsedEpub(
             metadata=app.BookMetadata(title="Title", author="Author"),
             chapters=[("Intro", "A"), ("", "B")],
         )
-        backend = SimpleNamespace(
-            name="mock",
-            sample_rate=24000,
-            initialize=MagicMock(),
+        backend = build_mock_backend(
             generate=MagicMock(side_effect=[
                 [np.array([0.1, 0.2], dtype=np.float32)],
                 [np.array([0.3, 0.4, 0.5], dtype=np.float32)],
                 [np.array([0.6, 0.7, 0.8, 0.9], dtype=np.float32)],
             ]),
-            cleanup=MagicMock(),
         )
-        export_m4b = MagicMock()
-
-        monkeypatch.setattr(app.sys, "version_info", (3, 12, 0))
-        monkeypatch.setattr(app, "parse_args", lambda: args)
-        monkeypatch.setattr(app, "EventEmitter", lambda **kwargs: events)
-        monkeypatch.setattr(app, "resolve_backend", lambda _: "mock")
-        monkeypatch.setattr(app, "parse_epub", lambda *args, **kwargs: parsed_epub)
-        monkeypatch.setattr(
-            app,
-            "split_text_to_chunks",
-            lambda chapters, chunk_chars: (
+        proc = FakeProc()
+        finalize_m4b = MagicMock()
+
+        patch_main_entry(
+            monkeypatch,
+            args,
+            events,
+            resolve_backend=lambda _: "mock",
+            parse_epub=lambda *args, **kwargs: parsed_epub,
+            split_text_to_chunks=lambda chapters, chunk_chars: (
                 [
                     app.TextChunk("Intro", "chunk-1"),
                     app.TextChunk("Intro", "chunk-2"),
@@ -576,13 +902,19 @@ class TestMainCleanupBehavior:
                 ],
                 [(0, "Intro"), (2, "")],
             ),
+            create_backend=lambda _: backend,
+            open_m4b_export_stream=lambda *args, **kwargs: proc,
+            finalize_m4b_export_stream=finalize_m4b,
         )
-        monkeypatch.setattr(app, "create_backend", lambda _: backend)
-        monkeypatch.setattr(app, "export_pcm_file_to_m4b", export_m4b)
 
         app.main()
 
-        chapter_infos = export_m4b.call_args.kwargs["chapters"]
+        assert finalize_m4b.call_args.args[0] is proc
+        assert finalize_m4b.call_args.kwargs["has_audio"] is True
+        assert finalize_m4b.call_args.kwargs["bitrate"] == "128k"
+        written = b"".join(call.args[0] for call in proc.stdin.write.call_args_list)
+        assert len(written) == 9 * 2
+        chapter_infos = finalize_m4b.call_args.kwargs["chapters"]
         assert chapter_infos == [
             app.ChapterInfo(title="Intro", start_sample=0, end_sample=5),
             app.ChapterInfo(title="Chapter 2", start_sample=5, end_sample=9),